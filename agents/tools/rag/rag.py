@@ -2,6 +2,7 @@ from typing import List
 import logging
 from agents.tools.rag.utils import format_supabase_chunks, format_supabase_page
 from routes.openai import generate_openai_embedding
+from routes import supabase as supabase_routes
 
 logger = logging.getLogger(__name__)
 
@@ -22,27 +23,25 @@ async def retrieve_llm(ctx, user_query: str) -> str:
         str: A formatted string containing the top 5 relevant documentation pages,
         or a message indicating no relevant documentation was found.
     """
-    logger.info(f"Retrieving documentation for query: {user_query}")
+    logger.info("Retrieving documentation for query: %s", user_query)
     query_embedding = await generate_openai_embedding(
         user_query, ctx.deps.openai_client
     )
 
-    table_query = {
-        "query_embedding": query_embedding,
-        "match_count": 10,
-    }
-
-    if ctx.deps.expertise:
-        table_query.update({"filter": {"source": ctx.deps.expertise}})
-
-    result = ctx.deps.supabase.rpc("match_site_pages", table_query).execute()
+    # Shared route: bounded concurrency, compact embedding literal and result cache
+    data = await supabase_routes.get_chunks_from_supabase(
+        ctx.deps.supabase,
+        query_embedding=query_embedding,
+        match_count=10,
+        source=ctx.deps.expertise,
+    )
 
-    if not result.data:
+    if not data:
         return "No relevant documentation found."
 
-    print(result.data)
+    logger.debug("Retrieved %d chunks for query", len(data))
 
-    return "\n\n---\n\n".join(format_supabase_chunks(result.data))
+    return "\n\n---\n\n".join(format_supabase_chunks(data))
 
 
 async def list_documentation_pages(ctx) -> List[str]:
@@ -61,24 +60,11 @@ async def list_documentation_pages(ctx) -> List[str]:
         empty list if no pages are found.
     """
     logger.info("Listing all documentation pages from Supabase...")
-    result = None
-    if ctx.deps.expertise:
-        # If expertise is set, filter by that source
-
-        result = (
-            ctx.deps.supabase.table("site_pages")
-            .select("url")
-            .eq("metadata->>source", ctx.deps.expertise)
-            .execute()
-        )
-
-    else:
-        result = ctx.deps.supabase.table("site_pages").select("url").execute()
 
-    if not result.data:
-        return []
-
-    return sorted(set(doc["url"] for doc in result.data))
+    # distinct_urls dedupes and sorts in Postgres and pages past the 1000-row cap
+    return await supabase_routes.get_document_urls_from_supabase(
+        ctx.deps.supabase, source=ctx.deps.expertise
+    )
 
 
 async def get_page_content(ctx, url: str) -> str:
@@ -97,29 +83,14 @@ async def get_page_content(ctx, url: str) -> str:
         str: The formatted content of the documentation page, or a message indicating
         no content was found for the given URL.
     """
-    logger.info(f"Retrieving content for URL: {url}")
-    result = None
-
-    if ctx.deps.expertise:
-        result = (
-            ctx.deps.supabase.table("site_pages")
-            .select("title, content, chunk_number")
-            .eq("url", url)
-            .eq("metadata->>source", ctx.deps.expertise)
-            .order("chunk_number")
-            .execute()
-        )
-
-    else:
-        result = (
-            ctx.deps.supabase.table("site_pages")
-            .select("title, content, chunk_number")
-            .eq("url", url)
-            .order("chunk_number")
-            .execute()
-        )
-
-    if not result.data:
+    logger.info("Retrieving content for URL: %s", url)
+
+    # Shares the TTL cache and in-flight dedup of the crawler's document reads
+    data = await supabase_routes.get_document_from_supabase(
+        ctx.deps.supabase, url=url, source=ctx.deps.expertise
+    )
+
+    if not data:
         return f"No content found for URL: {url}"
 
-    return format_supabase_page(result.data)
+    return format_supabase_page(data)
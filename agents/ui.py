@@ -1,4 +1,5 @@
 from __future__ import annotations
+import time
 from functools import partial
 
 from typing import Literal, TypedDict, Callable
@@ -62,6 +63,14 @@ class MessagePartEnum(Enum):
             return MessagePartEnum.DEFAULT
 
 
+def get_display_fn(part) -> Callable:
+    """resolve the display function for a message part from its part_kind"""
+
+    return MessagePartEnum.get_with_default(
+        part.part_kind.replace("-", "_").upper()
+    ).value
+
+
 def display_message_part(part):
     """
     Display a single part of a message in the Streamlit UI.
@@ -72,50 +81,155 @@ def display_message_part(part):
     if not hasattr(part, "content"):
         return
 
-    MessagePartEnum.get_with_default(part.part_kind.replace("-", "_").upper()).value(
-        content=part.content
+    get_display_fn(part)(content=part.content)
+
+
+def get_history_display_parts(messages: list) -> list:
+    """
+    Return (display_fn, content) pairs for every displayable part of messages.
+
+    Streamlit reruns the whole script on each interaction and only keeps what is
+    drawn again, so history has to be re-rendered every time. Resolving parts is
+    the part that can be saved: the pairs are kept in session state and only
+    messages added since the last rerun are resolved.
+    """
+
+    display_parts = st.session_state.setdefault("display_parts", [])
+    resolved_count = st.session_state.get("display_parts_count", 0)
+
+    # history was reset or replaced; resolve it from scratch
+    if resolved_count > len(messages):
+        display_parts.clear()
+        resolved_count = 0
+
+    for msg in messages[resolved_count:]:
+        if not isinstance(msg, (ModelRequest, ModelResponse)):
+            continue
+
+        for part in msg.parts:
+            if not hasattr(part, "content"):
+                continue
+
+            display_fn = get_display_fn(part)
+
+            if display_fn is not MessagePartEnum.DEFAULT.value:
+                display_parts.append((display_fn, part.content))
+
+    st.session_state.display_parts_count = len(messages)
+
+    return display_parts
+
+
+def trim_history_start(messages: list) -> list:
+    """
+    Drop leading messages until the history starts on a request turn.
+
+    Slicing the conversation to its most recent messages can start it on a
+    ModelRequest carrying tool returns whose tool calls were cut off (or on a
+    ModelResponse), which the model API rejects; the history is moved forward
+    to the first ModelRequest without tool-return parts.
+    """
+
+    for idx, msg in enumerate(messages):
+        if isinstance(msg, ModelRequest) and not any(
+            part.part_kind == "tool-return" for part in msg.parts
+        ):
+            return messages[idx:]
+
+    return []
+
+
+def get_message_history(messages: list, max_history: int) -> list:
+    """
+    Return the message_history for the next run: the most recent max_history
+    messages before the new user prompt (messages[-1]), trimmed to start on a
+    request turn.
+
+    pydantic-ai only adds the agent's system prompt when message_history is
+    empty and expects a non-empty history to start with it, so once the window
+    no longer reaches the first message its system-prompt parts are sent as a
+    request of their own ahead of the window.
+    """
+
+    history_end = len(messages) - 1
+    window = trim_history_start(
+        messages[max(0, history_end - max_history) : history_end]
     )
 
+    if not messages or not isinstance(messages[0], ModelRequest):
+        return window
+
+    if window and window[0] is messages[0]:
+        return window
+
+    system_parts = [
+        part for part in messages[0].parts if part.part_kind == "system-prompt"
+    ]
+
+    if not system_parts:
+        return window
+
+    return [ModelRequest(parts=system_parts), *window]
+
 
 async def run_agent_with_streaming(
     user_input: str,
     st,
     agent: PydanticAgent,
     dependencies: PydanticAIDependencies,
+    max_history: int = 200,
+    render_interval: float = 1 / 30,
 ) -> None:
     """
     Run the agent with streaming text for the user_input prompt,
     while maintaining the entire conversation in `st.session_state.messages`.
+
+    Only the most recent `max_history` messages are sent to the model so the
+    per-turn copy (and prompt size) stays bounded in long conversations; see
+    get_message_history for how the window keeps the system prompt.
+
+    Each markdown call re-sends and re-renders the whole message, so the
+    placeholder is redrawn at most once per `render_interval` seconds rather
+    than once per token, plus a final draw when the stream ends.
     """
 
+    prompt_idx = len(st.session_state.messages) - 1
+
     async with agent.run_stream(
         user_prompt=user_input,
         deps=dependencies,
-        message_history=st.session_state.messages[
-            :-1
-        ],  # pass entire conversation so far
+        # pass the recent conversation, excluding the new user prompt
+        message_history=get_message_history(st.session_state.messages, max_history),
     ) as result:
         # gather partial text to show streaming results incrementally
 
-        partial_text = ""
+        deltas = []
+        last_render = time.monotonic()
 
         message_placeholder = st.empty()
 
-        # render partial_text as it arrives
+        # render the text as it arrives, throttled to render_interval
         async for chunk in result.stream_text(delta=True):
-            partial_text += chunk
-            message_placeholder.markdown(partial_text)
-
-        # add new messages excluding initial user_prompt
-        filtered_messages = [
-            msg
-            for msg in result.new_messages()
-            if not (
-                hasattr(msg, "parts")
-                and any(part.part_kind == "user-prompt" for part in msg.parts)
-            )
-        ]
-        st.session_state.messages.extend(filtered_messages)
+            deltas.append(chunk)
+
+            now = time.monotonic()
+            if now - last_render >= render_interval:
+                message_placeholder.markdown("".join(deltas))
+                last_render = now
+
+        partial_text = "".join(deltas)
+        message_placeholder.markdown(partial_text)
+
+        # add new messages; the request holding the user_prompt replaces the
+        # one appended by the UI, so the system prompt pydantic-ai adds to the
+        # first request is kept in the conversation
+        for msg in result.new_messages():
+            if hasattr(msg, "parts") and any(
+                part.part_kind == "user-prompt" for part in msg.parts
+            ):
+                st.session_state.messages[prompt_idx] = msg
+            else:
+                st.session_state.messages.append(msg)
 
         # Add the final response to the messages
         st.session_state.messages.append(
@@ -137,12 +251,10 @@ async def streamlit_ui(
         st.session_state.messages = []
 
     # Display all messages from the conversation so far
-    # Each message is either a ModelRequest or ModelResponse.
-    # We iterate over their parts to decide how to display them.
-    for msg in st.session_state.messages:
-        if isinstance(msg, ModelRequest) or isinstance(msg, ModelResponse):
-            for part in msg.parts:
-                display_message_part(part)
+    # Each message is either a ModelRequest or ModelResponse; their parts are
+    # resolved to display functions once and replayed on every rerun
+    for display_fn, content in get_history_display_parts(st.session_state.messages):
+        display_fn(content=content)
 
     # Chat input for the user
     user_input = st.chat_input(default_chat_input)
@@ -154,6 +154,21 @@ class ResponseGetDataCrawler(ResponseGetData):
                 raw=res,
             )
 
+    def release_buffers(self) -> "ResponseGetDataCrawler":
+        """
+        Drop the page content once it has been stored and processed.
+
+        Keeps url, source and status so the result can still be reported, but
+        frees the HTML, markdown and raw crawler result, which dominate memory
+        on long crawls.
+        """
+        self.response = None
+        self.html = None
+        self.markdown = None
+        self.links = []
+        self.raw = None
+        return self
+
 
 @dataclass
 class ResponseGetDataSlack(ResponseGetData):
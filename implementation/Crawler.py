@@ -90,9 +90,7 @@ class Crawler_ProcessedChunk:
         )
 
     def compare_self_to_disk(self, md_path):
-        if not os.path.exists(md_path):
-            return False
-
+        # from_md_file raises PC_PathNotExist for a missing file
         try:
             md_chunk = self.from_md_file(md_path=md_path)
 
@@ -313,6 +311,8 @@ class Crawler_ProcessedChunk:
         embedding_model="text-embedding-3-small",
         debug_prn: bool = False,
         output_path: str = None,
+        updated_dt: Optional[str] = None,
+        is_generate_embedding: bool = True,
     ):
         """
         Generate metadata (title, summary, embedding) for this chunk.
@@ -325,6 +325,9 @@ class Crawler_ProcessedChunk:
             embedding_model (str): Model name for embedding generation
             debug_prn (bool): Whether to print debug info
             output_path (str): Path to save the result to
+            updated_dt (str, optional): Frontmatter timestamp shared by a batch
+            is_generate_embedding (bool): Set False when the embedding was already
+                produced by batch_generate_embeddings
 
         Returns:
             self: The current instance with updated metadata
@@ -337,17 +340,20 @@ class Crawler_ProcessedChunk:
         )
 
         # Get embedding
-        await self.get_embedding(
-            is_replace_llm_metadata=is_replace_llm_metadata,
-            model=embedding_model,
-            debug_prn=debug_prn,
-        )
+        if is_generate_embedding:
+            await self.get_embedding(
+                is_replace_llm_metadata=is_replace_llm_metadata,
+                model=embedding_model,
+                debug_prn=debug_prn,
+            )
 
         # Save to disk if output path provided
         if output_path:
             try:
-                supabase_routes.save_chunk_to_disk(
-                    output_path=output_path, data=self.to_json()
+                await supabase_routes.asave_chunk_to_disk(
+                    output_path=output_path,
+                    data=self.to_json(),
+                    updated_dt=updated_dt,
                 )
                 if debug_prn:
                     logger.info("Saved chunk to %s", output_path)
@@ -358,6 +364,72 @@ class Crawler_ProcessedChunk:
 
         return self
 
+    @classmethod
+    async def batch_generate_embeddings(
+        cls,
+        chunks: List["Crawler_ProcessedChunk"],
+        is_replace_llm_metadata: bool = False,
+        model="text-embedding-3-small",
+        batch_size: int = 96,
+        debug_prn: bool = False,
+    ) -> List["Crawler_ProcessedChunk"]:
+        """
+        Generate embeddings for many chunks with one API request per batch.
+
+        Chunks that already have an embedding (e.g. loaded from disk) are skipped
+        unless is_replace_llm_metadata is set. Vectors are assigned back to their
+        chunks in order.
+
+        Args:
+            chunks (List[Crawler_ProcessedChunk]): Chunks to embed; the client is
+                taken from the first chunk's Dependencies
+            is_replace_llm_metadata (bool): Whether to replace existing embeddings
+            model (str): Model name for embedding generation
+            batch_size (int): Maximum number of chunks per API request
+            debug_prn (bool): Whether to print debug info
+
+        Returns:
+            List[Crawler_ProcessedChunk]: The same chunks, updated in place
+        """
+        pending = [
+            chunk
+            for chunk in chunks
+            if chunk and (is_replace_llm_metadata or not chunk.embedding)
+        ]
+
+        if not pending:
+            return chunks
+
+        dependencies = pending[0].Dependencies
+        async_client = dependencies and dependencies.async_embedding_client
+
+        if async_client is None:
+            logger.warning("No OpenAI embedding client available in Dependencies")
+            for chunk in pending:
+                chunk.error_logs.append("No OpenAI client available")
+            return chunks
+
+        try:
+            embeddings = await openai_routes.generate_openai_embeddings(
+                texts=[chunk.content for chunk in pending],
+                async_client=async_client,
+                model=model,
+                batch_size=batch_size,
+                debug_prn=debug_prn,
+            )
+
+        except Exception as e:
+            message = f"Error creating embeddings: {str(e)}"
+            logger.error("Error creating embeddings: %s", str(e))
+            for chunk in pending:
+                chunk.error_logs.append(message)
+            return chunks
+
+        for chunk, embedding in zip(pending, embeddings):
+            chunk.embedding = embedding
+
+        return chunks
+
     def to_json(self):
         return {
             "url": self.url,
@@ -7,12 +7,57 @@ from routes import supabase as supabase_routes
 from implementation.Crawler import Crawler_ProcessedChunk, CrawlerDependencies
 
 # Standard library imports
+import os
 import logging
+import datetime as dt
+from typing import Optional
 
 # Set up logger
 logger = logging.getLogger(__name__)
 
 
+def get_chunk_folder(export_folder: str, url: str) -> str:
+    """Return the folder that holds the markdown chunks for a URL."""
+    return f"{export_folder}/chunks/{utcv.convert_url_to_file_name(url)}"
+
+
+def get_chunk_record(chunk: Crawler_ProcessedChunk) -> dict:
+    """Return the database row for a processed chunk."""
+    data = chunk.to_json()
+
+    # Remove source as it might be duplicated elsewhere in the schema
+    data.pop("source", None)
+
+    return data
+
+
+def build_processed_chunk(
+    url: str,
+    chunk: str,
+    chunk_number: int,
+    source: str,
+    chunk_path: str,
+    async_supabase_client,
+    async_openai_client,
+    async_embedding_client,
+) -> Crawler_ProcessedChunk:
+    """Create a chunk, picking up any title/summary/embedding saved at chunk_path."""
+    dependencies = CrawlerDependencies(
+        async_supabase_client=async_supabase_client,
+        async_openai_client=async_openai_client,
+        async_embedding_client=async_embedding_client,
+    )
+
+    return Crawler_ProcessedChunk.from_chunk(
+        content=chunk,
+        chunk_number=chunk_number,
+        url=url,
+        source=source,
+        output_path=chunk_path,
+        dependencies=dependencies,
+    )
+
+
 async def process_chunk(
     url,
     chunk,
@@ -25,13 +70,18 @@ async def process_chunk(
     export_folder,
     is_replace_llm_metadata: bool = False,
     debug_prn: bool = False,
+    chunk_folder: Optional[str] = None,
+    is_store_chunk: bool = True,
+    updated_dt: Optional[str] = None,
+    is_generate_embedding: bool = True,
 ):
     """
     Process a single chunk of content.
 
     Args:
         url (str): The URL the chunk is from
-        chunk (str): The content of the chunk
+        chunk (str | Crawler_ProcessedChunk): The content of the chunk, or a chunk
+            already created by build_processed_chunk
         chunk_number (int): The chunk number
         source (str): The source identifier
         async_supabase_client: The Supabase client
@@ -40,6 +90,12 @@ async def process_chunk(
         is_replace_llm_metadata (bool): Whether to replace existing metadata
         debug_prn (bool): Whether to print debug info
         async_openai_client: The OpenAI client
+        chunk_folder (str, optional): Precomputed folder for this URL's chunks
+        is_store_chunk (bool): Upsert the chunk now; process_rgd passes False and
+            stores all of a page's chunks in one batch instead
+        updated_dt (str, optional): Frontmatter timestamp shared by the page
+        is_generate_embedding (bool): Embed the chunk now; process_rgd passes False
+            after embedding the whole page with batch_generate_embeddings
 
     Returns:
         Crawler_ProcessedChunk: The processed chunk
@@ -48,47 +104,40 @@ async def process_chunk(
         logger.info("Starting chunk processing: %s - %d", url, chunk_number)
 
     try:
-        chunk_path = f"{export_folder}/chunks/{utcv.convert_url_to_file_name(url)}/{chunk_number}.md"
-
-        print(chunk_path, type(chunk_path))
-
-        dependencies = CrawlerDependencies(
-            async_supabase_client=async_supabase_client,
-            async_openai_client=async_openai_client,
-            async_embedding_client=async_embedding_client,
-        )
+        chunk_folder = chunk_folder or get_chunk_folder(export_folder, url)
+        chunk_path = f"{chunk_folder}/{chunk_number}.md"
 
-        chunk = Crawler_ProcessedChunk.from_chunk(
-            content=chunk,
-            chunk_number=chunk_number,
-            url=url,
-            source=source,
-            output_path=chunk_path,
-            dependencies=dependencies,
-        )
+        if not isinstance(chunk, Crawler_ProcessedChunk):
+            chunk = build_processed_chunk(
+                url=url,
+                chunk=chunk,
+                chunk_number=chunk_number,
+                source=source,
+                chunk_path=chunk_path,
+                async_supabase_client=async_supabase_client,
+                async_openai_client=async_openai_client,
+                async_embedding_client=async_embedding_client,
+            )
 
         # Generate metadata
         await chunk.generate_metadata(
             output_path=chunk_path,
             is_replace_llm_metadata=is_replace_llm_metadata,
             debug_prn=debug_prn,
+            updated_dt=updated_dt,
+            is_generate_embedding=is_generate_embedding,
         )
 
-        data = chunk.to_json()
-        # Remove source as it might be duplicated elsewhere in the schema
-
-        if "source" in data:
-            data.pop("source")
-
-        # try:
-        await supabase_routes.store_data_in_supabase_table(
-            async_supabase_client=async_supabase_client,
-            table_name=database_table_name,
-            data=data,
-        )
+        if is_store_chunk:
+            # try:
+            await supabase_routes.store_data_in_supabase_table(
+                async_supabase_client=async_supabase_client,
+                table_name=database_table_name,
+                data=get_chunk_record(chunk),
+            )
 
-        if debug_prn:
-            logger.info("Stored chunk in database: %s-%d", url, chunk_number)
+            if debug_prn:
+                logger.info("Stored chunk in database: %s-%d", url, chunk_number)
 
         # except Exception as db_error:
         #     error_msg = f"Error storing chunk in database: {str(db_error)}"
@@ -103,7 +152,6 @@ async def process_chunk(
     except Exception as e:
         msg = f"💀 Error processing chunk {url}-{chunk_number}: {str(e)}"
         logger.error(msg)
-        print(msg)
         raise e from e
         return None
 
@@ -118,6 +166,7 @@ async def process_rgd(
     debug_prn: bool = False,
     is_replace_llm_metadata: bool = False,
     max_conccurent_requests=5,
+    batcher: supabase_routes.ChunkBatcher = None,
 ):
     """
     Process a ResponseGetDataCrawler object.
@@ -132,6 +181,8 @@ async def process_rgd(
         debug_prn (bool): Whether to print debug info
         is_replace_llm_metadata (bool): Whether to replace existing metadata
         max_conccurent_requests (int): Maximum number of concurrent requests
+        batcher (ChunkBatcher): Buffer the page's rows in a batcher shared across
+            pages instead of upserting them here
 
     Returns:
         list: The processed chunks
@@ -145,31 +196,80 @@ async def process_rgd(
 
     chunks = utch.chunk_text(rgd.markdown or rgd.response)
 
+    # resolve and create the chunk folder once per page rather than once per chunk
+    chunk_folder = get_chunk_folder(export_folder, url)
+    os.makedirs(chunk_folder, exist_ok=True)
+
+    # one timestamp for the whole page keeps its chunk files consistent
+    updated_dt = dt.datetime.now().isoformat()
+
     if debug_prn:
         logger.info(
             "Generated %d chunks to process from ResponseGetDataCrawler", len(chunks)
         )
 
-    res = await utce.gather_with_concurrency(
-        *[
-            process_chunk(
-                url=url,
-                chunk=chunk,
-                chunk_number=idx,
-                source=source,
-                async_supabase_client=supabase_client,
-                async_openai_client=async_openai_client,
-                async_embedding_client=async_embedding_client,
-                database_table_name=database_table_name,
-                export_folder=export_folder,
-                debug_prn=debug_prn,
-                is_replace_llm_metadata=is_replace_llm_metadata,
-            )
-            for idx, chunk in enumerate(chunks)
-        ],
-        n=max_conccurent_requests,
+    processed_chunks = [
+        build_processed_chunk(
+            url=url,
+            chunk=chunk,
+            chunk_number=idx,
+            source=source,
+            chunk_path=f"{chunk_folder}/{idx}.md",
+            async_supabase_client=supabase_client,
+            async_openai_client=async_openai_client,
+            async_embedding_client=async_embedding_client,
+        )
+        for idx, chunk in enumerate(chunks)
+    ]
+
+    # embed the whole page in batched requests rather than one request per chunk
+    await Crawler_ProcessedChunk.batch_generate_embeddings(
+        processed_chunks,
+        is_replace_llm_metadata=is_replace_llm_metadata,
+        debug_prn=debug_prn,
     )
 
+    async def _process(chunk: Crawler_ProcessedChunk):
+        return await process_chunk(
+            url=url,
+            chunk=chunk,
+            chunk_number=chunk.chunk_number,
+            source=source,
+            async_supabase_client=supabase_client,
+            async_openai_client=async_openai_client,
+            async_embedding_client=async_embedding_client,
+            database_table_name=database_table_name,
+            export_folder=export_folder,
+            debug_prn=debug_prn,
+            is_replace_llm_metadata=is_replace_llm_metadata,
+            chunk_folder=chunk_folder,
+            is_store_chunk=False,
+            updated_dt=updated_dt,
+            is_generate_embedding=False,
+        )
+
+    # workers pull chunks from a bounded queue, so coroutines are only created
+    # as capacity frees up instead of all at once
+    res = await utce.map_with_concurrency(
+        _process, processed_chunks, n=max_conccurent_requests
+    )
+
+    records = [get_chunk_record(chunk) for chunk in res if chunk]
+
+    if batcher is not None:
+        await batcher.add(records)
+
+    else:
+        # store every chunk of the page with a single bulk upsert
+        await supabase_routes.store_data_in_supabase_table(
+            async_supabase_client=supabase_client,
+            table_name=database_table_name,
+            data=records,
+        )
+
+    if debug_prn:
+        logger.info("Stored %d chunks in database for %s", len(res), url)
+
     # except Exception as e:
     #     error_msg = f"Error processing chunks from ResponseGetDataCrawler: {str(e)}"
     #     logger.error(error_msg)
@@ -1,16 +1,15 @@
 import routes.crawler as crawler_routes
 import routes.supabase as supabase_routes
+import routes.openai as openai_routes
 import implementation.scraper as scraper
 import utils.convert as utcv
-import json
 
 # Standard library imports
 import os
+import asyncio
 import logging
-from typing import List
+from typing import List, Union
 from functools import partial
-from supabase import AsyncClient as AsyncSupabaseClient
-from openai import AsyncClient as AsyncOpenaiClient
 
 # Configure logging
 logging.basicConfig(level=logging.ERROR)
@@ -25,25 +24,32 @@ browser_config = crawler_routes.BrowserConfig(
     extra_args=["--disable-gpu", "--disable-dev-shm-usage", "--no-sandbox"],
 )
 
-supabase_client = AsyncSupabaseClient(
-    os.environ["SUPABASE_URL"], os.environ["SUPABASE_SERVICE_KEY"]
+async_openai_client = openai_routes.generate_openai_client(
+    api_key=os.environ["OPENAI_API_KEY"]
 )
 
-async_openai_client = AsyncOpenaiClient(api_key=os.environ["OPENAI_API_KEY"])
-
 
 async def main(
-    starting_url: str,
+    starting_urls: Union[str, List[str]],
     allowed_domains: List[str],
     export_folder: str,
     source: str,
     debug_prn: bool = False,
 ):
-    """Main function to crawl URLs and process the results."""
+    """Main function to crawl URLs and process the results.
+
+    Each seed in starting_urls is crawled concurrently inside a TaskGroup, so a
+    failure in one crawl cancels its siblings instead of leaking tasks.
+    """
+
+    if isinstance(starting_urls, str):
+        starting_urls = [starting_urls]
 
-    allowed_domains = allowed_domains or [utcv.extract_domain(starting_url)]
+    allowed_domains = allowed_domains or [
+        utcv.extract_domain(url) for url in starting_urls
+    ]
 
-    domain_filter = crawler_routes.DomainFilter(allowed_domains=allowed_domains)
+    domain_filter = crawler_routes.TrieDomainFilter(allowed_domains=allowed_domains)
 
     config = crawler_routes.CrawlerRunConfig(
         magic=True,
@@ -58,30 +64,64 @@ async def main(
         session_id=source,
     )
 
+    # Pooled, process-wide client built from SUPABASE_URL / SUPABASE_SERVICE_KEY
+    supabase_client = await supabase_routes.get_shared_client()
+
     storage_fn = partial(
         supabase_routes.save_chunk_to_disk, export_folder=export_folder
     )
 
+    # Resume from the last snapshot plus any page events logged after it
+    logs = crawler_routes.load_crawl_logs(source)
+
+    # rows from many small pages are packed into shared bulk upserts; pages
+    # whose rows fail to store are moved back to failed so they get recrawled
+    batcher = supabase_routes.ChunkBatcher(
+        supabase_client,
+        table_name="site_pages",
+        on_flush_error=partial(
+            crawler_routes.mark_urls_failed, logs, session_id=source
+        ),
+    )
+
     process_fn = partial(
         scraper.process_rgd,
         export_folder=export_folder,
         supabase_client=supabase_client,
         async_embedding_client=async_openai_client,
         async_openai_client=async_openai_client,
+        batcher=batcher,
     )
-    # Crawl URLs
-    with open("LOGS/crawl_progress_mermaid_js_docs.log", "r") as f:
-        logs = json.loads(f.read())
-
-    await crawler_routes.crawl_urls(
-        logs=logs,
-        starting_url=starting_url,
-        crawler_config=config,
-        browser_config=browser_config,
-        session_id=source,
-        storage_fn=storage_fn,
-        process_fn=process_fn,
-    )
+
+    crawl_error = None
+
+    try:
+        async with asyncio.TaskGroup() as tg:
+            for starting_url in starting_urls:
+                tg.create_task(
+                    crawler_routes.crawl_urls(
+                        logs=logs,
+                        starting_url=starting_url,
+                        crawler_config=config,
+                        browser_config=browser_config,
+                        session_id=source,
+                        storage_fn=storage_fn,
+                        process_fn=process_fn,
+                    )
+                )
+    except BaseException as e:
+        crawl_error = e
+        raise
+    finally:
+        try:
+            await batcher.aclose()
+        except Exception:
+            # a failed flush must not mask the crawl's own error
+            logger.exception("Failed to flush buffered chunks to Supabase")
+            if crawl_error is None:
+                raise
+        finally:
+            await openai_routes.close_openai_clients()
 
     # if logs.get("failed"):
     #     crawler_routes.crawl_url(
@@ -100,16 +140,16 @@ async def main(
 
 
 if __name__ == "__main__":
-    import asyncio
+    crawler_routes.raise_open_file_limit()
 
-    STARTING_URL = "https://mermaid.js.org/"
+    STARTING_URLS = ["https://mermaid.js.org/"]
     ALLOWED_DOMAINS = ["mermaid.js.org", "mermaid-js.github.io"]
     EXPORT_FOLDER = "EXPORT/"
     SOURCE = "mermaid_js_docs"
 
     asyncio.run(
         main(
-            starting_url=STARTING_URL,
+            starting_urls=STARTING_URLS,
             allowed_domains=ALLOWED_DOMAINS,
             export_folder=EXPORT_FOLDER,
             source=SOURCE,
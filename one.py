@@ -1,17 +1,16 @@
 import routes.crawler as crawler_routes
 import routes.supabase as supabase_routes
+import routes.openai as openai_routes
 import implementation.scraper as scraper
 import utils.convert as utcv
-import json
 import argparse
 
 # Standard library imports
 import os
+import asyncio
 import logging
-from typing import List
+from typing import List, Union
 from functools import partial
-from supabase import AsyncClient as AsyncSupabaseClient
-from openai import AsyncClient as AsyncOpenaiClient
 from routes.crawler import DefaultMarkdownGenerator
 
 # Configure logging
@@ -27,12 +26,10 @@ browser_config = crawler_routes.BrowserConfig(
     extra_args=["--disable-gpu", "--disable-dev-shm-usage", "--no-sandbox"],
 )
 
-supabase_client = AsyncSupabaseClient(
-    os.environ["SUPABASE_URL"], os.environ["SUPABASE_SERVICE_KEY"]
+async_openai_client = openai_routes.generate_openai_client(
+    api_key=os.environ["OPENAI_API_KEY"]
 )
 
-async_openai_client = AsyncOpenaiClient(api_key=os.environ["OPENAI_API_KEY"])
-
 
 wait_condition = """() => {
   return document.querySelector(".section-list-item, .article-list-item");
@@ -56,11 +53,21 @@ crawler_config = crawler_routes.CrawlerRunConfig(
 
 
 async def main(
-    url: str,
+    urls: Union[str, List[str]],
     export_folder: str,
     source: str,
 ):
-    """Main function to crawl URLs and process the results."""
+    """Main function to crawl URLs and process the results.
+
+    URLs are scraped concurrently inside a TaskGroup; results are returned in the
+    same order as urls.
+    """
+
+    if isinstance(urls, str):
+        urls = [urls]
+
+    # Pooled, process-wide client built from SUPABASE_URL / SUPABASE_SERVICE_KEY
+    supabase_client = await supabase_routes.get_shared_client()
 
     storage_fn = partial(
         supabase_routes.save_chunk_to_disk, export_folder=export_folder
@@ -74,13 +81,25 @@ async def main(
         async_openai_client=async_openai_client,
     )
 
-    return await crawler_routes.crawl_url(
-        crawler_config=crawler_config,
-        url=url,
-        session_id=source,
-        storage_fn=storage_fn,
-        process_fn=process_fn,
-    )
+    try:
+        async with asyncio.TaskGroup() as tg:
+            tasks = [
+                tg.create_task(
+                    crawler_routes.crawl_url(
+                        crawler_config=crawler_config,
+                        url=url,
+                        session_id=source,
+                        storage_fn=storage_fn,
+                        process_fn=process_fn,
+                    )
+                )
+                for url in urls
+            ]
+    finally:
+        await crawler_routes.close_shared_crawlers()
+        await openai_routes.close_openai_clients()
+
+    return [task.result() for task in tasks]
 
 
 def parse_arguments():
@@ -89,7 +108,11 @@ def parse_arguments():
         description="Crawl a website and process the results."
     )
     parser.add_argument(
-        "--url", type=str, required=True, help="The URL for the crawler."
+        "--url",
+        type=str,
+        nargs="+",
+        required=True,
+        help="One or more URLs for the crawler.",
     )
     parser.add_argument(
         "--source",
@@ -107,7 +130,7 @@ def parse_arguments():
 
 
 if __name__ == "__main__":
-    import asyncio
+    crawler_routes.raise_open_file_limit()
 
     args = parse_arguments()
 
@@ -115,7 +138,7 @@ if __name__ == "__main__":
 
     asyncio.run(
         main(
-            url=args.url,
+            urls=args.url,
             export_folder=args.export_folder,
             source=args.source,
         )
@@ -17,28 +17,130 @@ from crawl4ai.deep_crawling.filters import FilterChain, DomainFilter
 
 # Standard library imports
 import logging
-import json
 import asyncio
 import argparse
 import sys
 import os
-from typing import Callable, List, Optional
-
+import re
+import time
+import atexit
+import gc
+import weakref
+import datetime as dt
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+from functools import lru_cache, partial
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import (
+    AsyncIterator,
+    Callable,
+    Deque,
+    Dict,
+    List,
+    Optional,
+    TextIO,
+    Tuple,
+    Union,
+)
+
+import psutil
 from crawl4ai import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig, CacheMode
 
 # for this module
 from crawl4ai import CrawlerMonitor, DisplayMode, RateLimiter
 from crawl4ai.async_dispatcher import MemoryAdaptiveDispatcher
 
+try:
+    from crawl4ai import LXMLWebScrapingStrategy
+except ImportError:  # older crawl4ai releases only ship the BeautifulSoup strategy
+    LXMLWebScrapingStrategy = None
+
 from client.ResponseGetData import ResponseGetDataCrawler
 from client.MafiaError import MafiaError
-
+import utils.convert as utcv
+from utils.files import atomic_write
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class _LoopState:
+    """
+    Per-event-loop crawler state.
+
+    asyncio locks and futures, like the browsers driven through them, are bound
+    to the loop that first uses them, so sharing them module-wide breaks as soon
+    as a second loop appears (e.g. asyncio.run per call).
+    """
+
+    # Started crawlers shared across crawl_url calls, keyed by profile directory
+    # for persistent configs and id(BrowserConfig) otherwise; entries keep the
+    # config, the crawler and the profile directory it claimed
+    crawler_pool: Dict[
+        Union[int, str], Tuple[BrowserConfig, AsyncWebCrawler, Optional[str]]
+    ] = field(default_factory=dict)
+    crawler_pool_lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+    # Fetches currently running in crawl_url, keyed by url and the callbacks and
+    # logs they run with, so concurrent identical calls share one fetch
+    inflight: Dict[tuple, asyncio.Future] = field(default_factory=dict)
+    inflight_lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+
+_loop_states: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopState]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _get_loop_state() -> _LoopState:
+    """Return the crawler state for the running event loop, creating it once."""
+    loop = asyncio.get_running_loop()
+    state = _loop_states.get(loop)
+
+    if state is None:
+        state = _loop_states[loop] = _LoopState()
+
+    return state
+
+
+# Bounded pool for blocking storage callbacks and progress snapshots
+_io_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="crawler-io")
+
+# Persistent Chromium profiles, one per crawl session
+DEFAULT_PROFILE_DIR = "~/.mafia_crawler/profiles/{session_id}"
+PROFILE_LOCK_FILE = ".mafia_crawler.lock"
+_held_profile_locks: set = set()
+
+# HTTP status codes that signal the origin is throttling us
+RATE_LIMIT_CODES = [429, 503]
+
+# (max available GiB, memory_threshold_percent, max_session_permit), smallest first
+MEMORY_TIERS = [
+    (2, 60.0, 2),
+    (4, 65.0, 5),
+    (8, 70.0, 10),
+    (16, 75.0, 25),
+    (32, 80.0, 50),
+    (float("inf"), 85.0, 100),
+]
+MEMORY_TIER_INTERVAL = 300.0  # seconds between memory tier re-evaluations
+
+# Duration strings used by x-ratelimit-reset headers, e.g. "1m30s" or "250ms"
+_DURATION_PATTERN = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+
+# Progress logging: per-page JSONL events plus a periodic full snapshot
+GC_COLLECT_INTERVAL = 200  # pages between forced garbage collections
+LOGS_FOLDER = "LOGS"
+PROGRESS_SNAPSHOT_INTERVAL = 500
+_is_logs_folder_ready = False
+_event_log_handles: Dict[str, TextIO] = {}
+
+
 class CrawlerRouteError(MafiaError):
     """
     Custom exception for crawler route errors.
@@ -55,52 +157,792 @@ class CrawlerRouteError(MafiaError):
         super().__init__(message=message, exception=exception)
 
 
-def create_default_browser_config() -> BrowserConfig:
+def create_default_browser_config(
+    session_id: Optional[str] = None,
+    user_data_dir: Optional[str] = None,
+) -> BrowserConfig:
     """
     Creates a default browser configuration with recommended settings.
 
+    When a session_id (or explicit user_data_dir) is provided, Chromium runs with
+    a persistent profile under DEFAULT_PROFILE_DIR so its HTTP cache, cookies and
+    service workers survive between runs of the same crawl. Building the config
+    does not claim the profile: each crawler started from it takes the profile
+    lock (see claim_browser_profile), and falls back to a throwaway profile if
+    another crawl owns it.
+
+    The config without a profile is cached and shared between calls (which also
+    lets the crawler pool reuse one browser for it); clone it rather than mutate.
+
+    Args:
+        session_id (str, optional): Session used to name the persistent profile
+        user_data_dir (str, optional): Explicit profile directory
+
     Returns:
         BrowserConfig: Configured browser settings object
     """
-    browser = BrowserConfig(
+    if not (session_id or user_data_dir):
+        return _create_shared_browser_config()
+
+    return BrowserConfig(
+        browser_type="chromium",  # stay on chromium; persistent webkit contexts can hang
+        headless=True,
+        verbose=True,
+        extra_args=["--disable-gpu", "--disable-dev-shm-usage", "--no-sandbox"],
+        use_persistent_context=True,
+        use_managed_browser=True,
+        user_data_dir=os.path.expanduser(
+            user_data_dir or DEFAULT_PROFILE_DIR.format(session_id=session_id)
+        ),
+    )
+
+
+@lru_cache(maxsize=1)
+def _create_shared_browser_config() -> BrowserConfig:
+    return BrowserConfig(
         browser_type="chromium",
         headless=True,
         verbose=True,
         extra_args=["--disable-gpu", "--disable-dev-shm-usage", "--no-sandbox"],
     )
 
-    return browser
 
+def claim_browser_profile(
+    browser_config: BrowserConfig,
+) -> Tuple[BrowserConfig, Optional[str]]:
+    """
+    Claims the persistent profile of browser_config for one crawler instance.
+
+    Only one browser may own a profile at a time, including within this
+    process. If the profile is locked, a clone of browser_config without the
+    persistent profile is returned instead of risking profile corruption.
+
+    Args:
+        browser_config (BrowserConfig): Config the crawler will be started with
+
+    Returns:
+        Tuple[BrowserConfig, Optional[str]]: The config to start the crawler
+            with, and the profile directory to pass to release_browser_profile
+            once the crawler is closed (None if nothing was claimed)
+    """
+    profile_dir = getattr(browser_config, "user_data_dir", None)
+
+    if not (getattr(browser_config, "use_persistent_context", False) and profile_dir):
+        return browser_config, None
+
+    if acquire_profile_lock(profile_dir):
+        return browser_config, profile_dir
+
+    logger.warning(
+        "Browser profile %s is in use by another crawl; running without a persistent profile",
+        profile_dir,
+    )
+
+    fallback = browser_config.clone(
+        use_persistent_context=False, use_managed_browser=False, user_data_dir=None
+    )
+    return fallback, None
+
+
+def release_browser_profile(profile_dir: Optional[str]):
+    """Releases a profile claimed by claim_browser_profile; None is ignored."""
+    if profile_dir:
+        _release_profile_lock(os.path.join(profile_dir, PROFILE_LOCK_FILE))
 
-def create_default_crawler_config() -> CrawlerRunConfig:
+
+def acquire_profile_lock(profile_dir: str) -> bool:
+    """
+    Claims a browser profile directory for this process with a pid lockfile.
+
+    A lock left behind by a process that is no longer running is taken over. A
+    lock already held by this process is not shared. Locks still held when this
+    process exits are released.
+
+    Args:
+        profile_dir (str): The browser profile directory
+
+    Returns:
+        bool: True if the caller now owns the profile
+    """
+    os.makedirs(profile_dir, exist_ok=True)
+    lock_path = os.path.join(profile_dir, PROFILE_LOCK_FILE)
+
+    for _ in range(2):
+        try:
+            fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+        except FileExistsError:
+            if not _is_stale_lock(lock_path):
+                return False
+
+            try:
+                os.remove(lock_path)
+            except FileNotFoundError:
+                pass
+            continue
+
+        with os.fdopen(fd, "w") as f:
+            f.write(str(os.getpid()))
+
+        _held_profile_locks.add(lock_path)
+        return True
+
+    return False
+
+
+def _is_stale_lock(lock_path: str) -> bool:
+    try:
+        with open(lock_path, "r") as f:
+            pid = int(f.read().strip() or 0)
+    except (OSError, ValueError):
+        return True
+
+    if pid == os.getpid():
+        return False
+
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return True
+    except (PermissionError, OSError):
+        return False
+
+    return False
+
+
+def _release_profile_lock(lock_path: str):
+    _held_profile_locks.discard(lock_path)
+
+    try:
+        os.remove(lock_path)
+    except OSError:
+        pass
+
+
+@atexit.register
+def _release_held_profile_locks():
+    for lock_path in list(_held_profile_locks):
+        _release_profile_lock(lock_path)
+
+
+@lru_cache(maxsize=8)
+def create_default_crawler_config(
+    cache_mode: CacheMode = CacheMode.ENABLED,
+) -> CrawlerRunConfig:
     """
     Creates a default crawler configuration with recommended settings.
 
+    The cache is enabled by default so recrawls of the same domain are served
+    from crawl4ai's cache; pass CacheMode.BYPASS for a one-shot fresh crawl.
+    Note that CrawlerRunConfig itself does not default to ENABLED, so the mode
+    is always set explicitly here.
+
+    The result is cached and shared between calls; use .clone() to derive a
+    modified config rather than mutating it.
+
+    Pages are parsed with LXMLWebScrapingStrategy (libxml2) when the installed
+    crawl4ai provides it, falling back to the default strategy otherwise.
+
+    Args:
+        cache_mode (CacheMode): crawl4ai cache behaviour for the run.
+
     Returns:
         CrawlerRunConfig: Configured crawler settings object
     """
-    return CrawlerRunConfig(cache_mode=CacheMode.BYPASS)
+    if LXMLWebScrapingStrategy is None:
+        return CrawlerRunConfig(cache_mode=cache_mode)
+
+    return CrawlerRunConfig(
+        cache_mode=cache_mode, scraping_strategy=LXMLWebScrapingStrategy()
+    )
+
+
+class TrieDomainFilter(DomainFilter):
+    """
+    DomainFilter backed by a trie of reversed hostname labels.
+
+    Allowed and blocked domains are compiled once into nested dicts keyed on
+    labels from the TLD inward ("docs.example.com" -> com -> example -> docs), so
+    each discovered link costs a handful of dict lookups. A host matches a
+    domain when it is that domain or one of its subdomains.
+    """
+
+    _TERMINAL = "$"  # never a valid hostname label
+
+    def __init__(self, allowed_domains=None, blocked_domains=None):
+        super().__init__(
+            allowed_domains=allowed_domains, blocked_domains=blocked_domains
+        )
+
+        if isinstance(allowed_domains, str):
+            allowed_domains = [allowed_domains]
+
+        if isinstance(blocked_domains, str):
+            blocked_domains = [blocked_domains]
+
+        self._allowed_trie = (
+            self._build_trie(allowed_domains) if allowed_domains else None
+        )
+        self._blocked_trie = self._build_trie(blocked_domains or [])
+
+    @classmethod
+    def _build_trie(cls, domains: List[str]) -> dict:
+        root: dict = {}
+
+        for domain in domains:
+            node = root
+            for label in reversed(domain.lower().strip(".").split(".")):
+                node = node.setdefault(label, {})
+            node[cls._TERMINAL] = True
+
+        return root
+
+    @classmethod
+    def _matches(cls, trie: dict, host: str) -> bool:
+        node = trie
+
+        for label in reversed(host.split(".")):
+            node = node.get(label)
+
+            if node is None:
+                return False
+
+            if cls._TERMINAL in node:
+                return True
+
+        return False
+
+    def apply(self, url: str) -> bool:
+        host = urlsplit(url).hostname or ""
+
+        is_allowed = not self._matches(self._blocked_trie, host) and (
+            self._allowed_trie is None or self._matches(self._allowed_trie, host)
+        )
+
+        self._update_stats(is_allowed)
+        return is_allowed
+
+
+class HeaderAwareRateLimiter(RateLimiter):
+    """
+    RateLimiter that honours Retry-After and x-ratelimit-* response headers.
+
+    When a response says the host is (nearly) out of quota, the next request to
+    that host waits exactly until the advertised reset instead of the blind random
+    base_delay. An optional sliding-window requests-per-minute cap per host is
+    enforced on top.
+
+    Args:
+        requests_per_minute (dict, optional): Per-hostname RPM caps
+        default_requests_per_minute (int, optional): RPM cap for other hosts
+        *args, **kwargs: Forwarded to crawl4ai's RateLimiter
+    """
+
+    def __init__(
+        self,
+        *args,
+        requests_per_minute: Optional[Dict[str, int]] = None,
+        default_requests_per_minute: Optional[int] = None,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self.requests_per_minute = requests_per_minute or {}
+        self.default_requests_per_minute = default_requests_per_minute
+        self._resume_at: Dict[str, float] = {}
+        self._request_times: Dict[str, Deque[float]] = {}
+
+    def observe_headers(self, url: str, headers: Optional[Dict[str, str]]):
+        """
+        Records rate-limit hints from a response's headers.
+
+        Args:
+            url (str): The URL the response came from
+            headers (dict, optional): The response headers
+        """
+        if not headers:
+            return
+
+        headers = {key.lower(): value for key, value in headers.items()}
+        now = time.time()
+
+        wait = parse_retry_after(headers.get("retry-after"), now=now)
+
+        remaining = _to_float(
+            headers.get("x-ratelimit-remaining-requests")
+            or headers.get("x-ratelimit-remaining")
+        )
+        limit = _to_float(
+            headers.get("x-ratelimit-limit-requests")
+            or headers.get("x-ratelimit-limit")
+        )
+
+        if wait is None and remaining is not None:
+            if remaining <= max(2, 0.1 * (limit or 0)):
+                wait = parse_retry_after(
+                    headers.get("x-ratelimit-reset-requests")
+                    or headers.get("x-ratelimit-reset"),
+                    now=now,
+                )
+
+        if wait:
+            domain = self.get_domain(url)
+            self._resume_at[domain] = max(self._resume_at.get(domain, 0), now + wait)
+
+    async def wait_if_needed(self, url: str) -> None:
+        domain = self.get_domain(url)
+        delay = self._resume_at.pop(domain, 0) - time.time()
+
+        if delay > 0:
+            logger.debug("Waiting %.2fs for %s rate limit reset", delay, domain)
+            await asyncio.sleep(delay)
+        else:
+            await super().wait_if_needed(url)
+
+        await self._wait_for_window(domain)
+
+    async def _wait_for_window(self, domain: str):
+        rpm = self.requests_per_minute.get(domain, self.default_requests_per_minute)
+
+        if not rpm:
+            return
+
+        request_times = self._request_times.setdefault(domain, deque())
+        now = time.monotonic()
+
+        while request_times and now - request_times[0] >= 60:
+            request_times.popleft()
+
+        if len(request_times) >= rpm:
+            await asyncio.sleep(60 - (now - request_times[0]))
+            request_times.popleft()
+            now = time.monotonic()
+
+        request_times.append(now)
+
+
+def _to_float(value) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_retry_after(
+    value: Optional[str], now: Optional[float] = None
+) -> Optional[float]:
+    """
+    Parses a Retry-After / x-ratelimit-reset header value into seconds to wait.
+
+    Accepts delta seconds ("30"), epoch timestamps, HTTP dates, and duration
+    strings such as "1m30s" or "250ms".
+
+    Args:
+        value (str, optional): The raw header value
+        now (float, optional): Current epoch time; defaults to time.time()
+
+    Returns:
+        Optional[float]: Seconds to wait, or None if the value is not understood
+    """
+    if not value:
+        return None
 
+    now = now or time.time()
+    number = _to_float(value)
 
-def generate_async_dispatcher() -> MemoryAdaptiveDispatcher:
-    rate_limiter = RateLimiter(
+    if number is not None:
+        # large values are epoch timestamps rather than deltas
+        return max(number - now, 0) if number > 1e9 else max(number, 0)
+
+    durations = _DURATION_PATTERN.findall(value)
+
+    if durations and "".join(amount + unit for amount, unit in durations) == value:
+        return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in durations)
+
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - now, 0)
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+def get_memory_tier(available_gb: Optional[float] = None) -> Tuple[float, int]:
+    """
+    Picks dispatcher memory settings for the host from MEMORY_TIERS.
+
+    Args:
+        available_gb (float, optional): Available memory in GiB; read from
+            psutil when omitted.
+
+    Returns:
+        Tuple[float, int]: (memory_threshold_percent, max_session_permit)
+    """
+    if available_gb is None:
+        available_gb = psutil.virtual_memory().available / 2**30
+
+    tier_index, (_, threshold_percent, session_permit) = next(
+        (index, tier)
+        for index, tier in enumerate(MEMORY_TIERS)
+        if available_gb <= tier[0]
+    )
+
+    if tier_index == 0:
+        logger.warning(
+            f"warning: low memory is impacting performance "
+            f"({available_gb:.1f} GiB available, {session_permit} sessions)"
+        )
+
+    msg = (
+        f"Memory tier for {available_gb:.1f} GiB available: "
+        f"{threshold_percent}% threshold, {session_permit} sessions"
+    )
+    logger.info(msg)
+
+    return threshold_percent, session_permit
+
+
+def generate_async_dispatcher(
+    memory_threshold_percent: Optional[float] = None,
+    max_session_permit: Optional[int] = None,
+) -> MemoryAdaptiveDispatcher:
+    """
+    Creates a rate limited MemoryAdaptiveDispatcher sized for the host.
+
+    Settings not passed explicitly come from get_memory_tier, so small containers
+    run fewer sessions and large hosts are not left underutilized.
+    """
+    rate_limiter = HeaderAwareRateLimiter(
         base_delay=(2.0, 4.0),  # Random delay between 2-4 seconds
         max_delay=30.0,  # Cap delay at 30 seconds
         max_retries=5,  # Retry up to 5 times on rate-limiting errors
-        rate_limit_codes=[429, 503],  # Handle these HTTP status codes
+        rate_limit_codes=RATE_LIMIT_CODES,  # Handle these HTTP status codes
     )
 
+    if memory_threshold_percent is None or max_session_permit is None:
+        tier_threshold_percent, tier_session_permit = get_memory_tier()
+
+        memory_threshold_percent = memory_threshold_percent or tier_threshold_percent
+        max_session_permit = max_session_permit or tier_session_permit
+
     return MemoryAdaptiveDispatcher(
-        memory_threshold_percent=70.0,
+        memory_threshold_percent=memory_threshold_percent,
         check_interval=1.0,
-        max_session_permit=10,
+        max_session_permit=max_session_permit,
         rate_limiter=rate_limiter,
     )
 
 
+async def monitor_memory_pressure(
+    dispatcher: MemoryAdaptiveDispatcher,
+    concurrency_controller: Optional["AIMDConcurrencyController"] = None,
+    interval: float = MEMORY_TIER_INTERVAL,
+):
+    """
+    Re-evaluates the memory tier every interval seconds until cancelled.
+
+    The dispatcher threshold is updated directly. The session permit becomes the
+    concurrency controller's ceiling when one is given (so AIMD keeps adapting
+    below it), otherwise it is applied to the dispatcher.
+    """
+    while True:
+        await asyncio.sleep(interval)
+
+        threshold_percent, session_permit = await asyncio.to_thread(get_memory_tier)
+        dispatcher.memory_threshold_percent = threshold_percent
+
+        if concurrency_controller:
+            concurrency_controller.max_concurrency = session_permit
+            concurrency_controller._apply()
+        else:
+            dispatcher.max_session_permit = session_permit
+
+
+@dataclass
+class AIMDConcurrencyController:
+    """
+    Adapts a dispatcher's concurrency with additive-increase / multiplicative-decrease.
+
+    Latencies are collected over a window of results; when the window's mean is
+    at or below target_latency the permit count grows by alpha, otherwise it is
+    multiplied by beta. Rate-limit responses (429/503) and connection failures
+    apply the multiplicative decrease immediately. The new value is pushed to
+    dispatcher.max_session_permit, which the dispatcher reads on each schedule.
+
+    Attributes:
+        dispatcher: The MemoryAdaptiveDispatcher being controlled
+        target_latency: Mean per-page latency (seconds) considered healthy
+        alpha: Additive increase applied per healthy window
+        beta: Multiplicative decrease factor on overload
+        min_concurrency: Lower bound on session permits
+        max_concurrency: Upper bound on session permits
+        window: Number of latency samples per adjustment
+    """
+
+    dispatcher: MemoryAdaptiveDispatcher
+    target_latency: float = 5.0
+    alpha: float = 0.5
+    beta: float = 0.5
+    min_concurrency: int = 1
+    max_concurrency: int = 64
+    window: int = 20
+    concurrency: float = field(init=False)
+    latencies: Deque[float] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.concurrency = float(self.dispatcher.max_session_permit)
+        self.latencies = deque(maxlen=self.window)
+
+    def _apply(self) -> int:
+        self.concurrency = min(
+            max(self.concurrency, self.min_concurrency), self.max_concurrency
+        )
+        self.dispatcher.max_session_permit = int(self.concurrency)
+        return self.dispatcher.max_session_permit
+
+    def decrease(self) -> int:
+        """Applies the multiplicative decrease immediately."""
+        self.latencies.clear()
+        self.concurrency *= self.beta
+        return self._apply()
+
+    def record(self, res) -> int:
+        """
+        Records one crawl4ai result and adjusts concurrency when a window fills.
+
+        Args:
+            res: A CrawlResult from arun_many
+
+        Returns:
+            int: The dispatcher's current max_session_permit
+        """
+        status_code = getattr(res, "status_code", None)
+
+        is_connection_error = not getattr(res, "success", False) and not status_code
+
+        if status_code in RATE_LIMIT_CODES or is_connection_error:
+            return self.decrease()
+
+        latency = get_dispatch_latency(res)
+
+        if latency is None:
+            return self.dispatcher.max_session_permit
+
+        self.latencies.append(latency)
+
+        if len(self.latencies) < self.window:
+            return self.dispatcher.max_session_permit
+
+        mean_latency = sum(self.latencies) / len(self.latencies)
+        self.latencies.clear()
+
+        if mean_latency <= self.target_latency:
+            self.concurrency += self.alpha
+        else:
+            self.concurrency *= self.beta
+
+        return self._apply()
+
+
+def get_dispatch_latency(res) -> Optional[float]:
+    """Returns the wall time in seconds the dispatcher spent on a result, if known."""
+    dispatch_result = getattr(res, "dispatch_result", None)
+
+    start_time = getattr(dispatch_result, "start_time", None)
+    end_time = getattr(dispatch_result, "end_time", None)
+
+    if start_time is None or end_time is None:
+        return None
+
+    if isinstance(start_time, dt.datetime):
+        return (end_time - start_time).total_seconds()
+
+    return end_time - start_time
+
+
+def raise_open_file_limit(target: int = 65536) -> Optional[int]:
+    """
+    Raises the soft RLIMIT_NOFILE toward target (capped at the hard limit).
+
+    Chromium subprocesses plus many concurrent HTTP connections quickly exhaust
+    the common default of 1024 descriptors.
+
+    Args:
+        target (int): Desired soft limit for open file descriptors.
+
+    Returns:
+        Optional[int]: The resulting soft limit, or None if unsupported (e.g. Windows).
+    """
+    try:
+        import resource
+
+        soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+        new_soft = target if hard == resource.RLIM_INFINITY else min(hard, target)
+
+        if new_soft > soft:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (new_soft, hard))
+            logger.debug("Raised RLIMIT_NOFILE from %s to %s", soft, new_soft)
+            return new_soft
+
+        return soft
+
+    except (ImportError, ValueError, OSError) as e:
+        logger.debug("Unable to raise RLIMIT_NOFILE: %s", e)
+        return None
+
+
+def init_crawl_logs(logs: Optional[dict] = None) -> dict:
+    """
+    Normalizes crawl logs to {"success": set, "failed": set}, in place.
+
+    Logs loaded from a progress file hold lists; sets keep membership checks O(1)
+    on large crawls. The same dict is returned so callers keep their reference.
+
+    Args:
+        logs (dict, optional): Existing logs, e.g. loaded from a progress file.
+
+    Returns:
+        dict: The normalized logs dictionary.
+    """
+    logs = logs if logs is not None else {}
+
+    for key in ("success", "failed"):
+        if not isinstance(logs.get(key), set):
+            logs[key] = set(logs.get(key) or [])
+
+    return logs
+
+
+def _ensure_logs_folder():
+    """Creates the LOGS folder once per process instead of stat-ing on every write."""
+    global _is_logs_folder_ready
+
+    if not _is_logs_folder_ready:
+        os.makedirs(LOGS_FOLDER, exist_ok=True)
+        _is_logs_folder_ready = True
+
+
+def log_event(session_id: str, url: str, status: str):
+    """
+    Appends a single crawl event to the session's JSONL event log.
+
+    Each page costs one short line instead of a rewrite of the full logs dict;
+    log_progress writes the full snapshot only periodically.
+
+    Args:
+        session_id (str): Unique session identifier.
+        url (str): The URL the event refers to.
+        status (str): Event status, e.g. "success" or "failed".
+    """
+    handle = _event_log_handles.get(session_id)
+
+    if handle is None:
+        _ensure_logs_folder()
+        handle = _event_log_handles[session_id] = open(
+            f"{LOGS_FOLDER}/crawl_progress_{session_id}.jsonl",
+            "a",
+            encoding="utf-8",
+            buffering=1,  # line buffered so events survive a crash
+        )
+
+    handle.write(
+        utcv.json_dumps(
+            {"url": url, "status": status, "t": dt.datetime.now().isoformat()}
+        )
+        + "\n"
+    )
+
+
+def close_event_log(session_id: str):
+    """Closes the JSONL event log handle opened by log_event for a session."""
+    handle = _event_log_handles.pop(session_id, None)
+
+    if handle is not None:
+        handle.close()
+
+
+def load_crawl_logs(session_id: str) -> dict:
+    """
+    Rebuilds a session's crawl logs from its snapshot and JSONL event log.
+
+    The snapshot (log_progress) is only written every PROGRESS_SNAPSHOT_INTERVAL
+    pages, so events appended by log_event since then are replayed on top of it
+    in order; the latest event for a URL decides whether it is success or failed.
+    A crawl that stopped between snapshots therefore resumes where it left off.
+
+    Args:
+        session_id (str): Unique session identifier.
+
+    Returns:
+        dict: Logs normalized by init_crawl_logs; empty if nothing was logged.
+    """
+    base_path = f"{LOGS_FOLDER}/crawl_progress_{session_id}"
+    logs = {}
+
+    try:
+        with open(f"{base_path}.log", "rb") as f:
+            logs = utcv.json_loads(f.read())
+    except FileNotFoundError:
+        pass
+    except ValueError as e:
+        logger.warning(
+            "Ignoring unreadable snapshot %s.log, replaying events only: %s",
+            base_path,
+            e,
+        )
+
+    logs = init_crawl_logs(logs)
+
+    try:
+        with open(f"{base_path}.jsonl", "rb") as f:
+            for line in f:
+                try:
+                    event = utcv.json_loads(line)
+                except ValueError:
+                    # a crash can leave the last line half written
+                    logger.warning("Skipping malformed event in %s.jsonl", base_path)
+                    continue
+
+                if event.get("status") == "success":
+                    logs["success"].add(event["url"])
+                    logs["failed"].discard(event["url"])
+                else:
+                    logs["failed"].add(event["url"])
+                    logs["success"].discard(event["url"])
+    except FileNotFoundError:
+        pass
+
+    return logs
+
+
+def mark_urls_failed(logs: dict, urls: List[str], session_id: Optional[str] = None):
+    """
+    Moves URLs that were recorded as successful back to the failed set.
+
+    Used when a page's results are stored after it was counted, e.g. as the
+    on_flush_error hook of a supabase ChunkBatcher, so the next run recrawls it.
+
+    Args:
+        logs (dict): Crawl logs, normalized by init_crawl_logs.
+        urls (List[str]): The URLs whose results were not stored.
+        session_id (str, optional): Also record a failed event for each URL.
+    """
+    logs = init_crawl_logs(logs)
+
+    for url in urls:
+        if not url:
+            continue
+
+        logs["success"].discard(url)
+        logs["failed"].add(url)
+
+        if session_id:
+            log_event(session_id, url, "failed")
+
+
 def log_progress(logs: dict, session_id: str, page_count: int):
     """
-    Logs progress periodically and writes logs to a file.
+    Logs progress and writes a snapshot of the logs to a file.
+
+    The snapshot is written compactly and is intended to be called every
+    PROGRESS_SNAPSHOT_INTERVAL pages and at the end of a crawl; per-page events
+    go through log_event.
 
     Args:
         logs (dict): Dictionary containing crawl logs.
@@ -110,24 +952,145 @@ def log_progress(logs: dict, session_id: str, page_count: int):
     msg = f"Crawled {page_count} pages so far..."
     logger.info(msg)
 
-    if not os.path.exists("LOGS"):
-        os.makedirs("LOGS")
+    _ensure_logs_folder()
+
+    # concurrent crawls of one session snapshot the same file, and a crash must
+    # not leave it truncated; atomic_write swaps in a complete file
+    atomic_write(
+        f"{LOGS_FOLDER}/crawl_progress_{session_id}.log",
+        [
+            utcv.json_dumpb(
+                {
+                    key: sorted(value) if isinstance(value, (set, list)) else value
+                    for key, value in logs.items()
+                }
+            )
+        ],
+    )
+
+
+async def alog_progress(logs: dict, session_id: str, page_count: int):
+    """
+    Runs log_progress on the crawler I/O thread pool.
+
+    The logs sets are copied on the event loop thread first, so the crawl can
+    keep mutating them while the snapshot is sorted, serialized and written.
+
+    Args:
+        logs (dict): Dictionary containing crawl logs.
+        session_id (str): Unique session identifier.
+        page_count (int): Number of pages crawled so far.
+    """
+    snapshot = {
+        key: list(value) if isinstance(value, set) else value
+        for key, value in logs.items()
+    }
 
-    with open(f"LOGS/crawl_progress_{session_id}.log", "w") as f:
-        f.write(json.dumps(logs, indent=4))
+    await asyncio.get_running_loop().run_in_executor(
+        _io_executor, partial(log_progress, snapshot, session_id, page_count)
+    )
 
 
-def log_summary(results: list):
+async def run_storage_fn(storage_fn: Callable, rgd: ResponseGetDataCrawler):
+    """
+    Invokes a storage callback without blocking the event loop.
+
+    Coroutine functions are awaited directly; synchronous callbacks (typically
+    disk or database writes) run on the crawler I/O thread pool.
+
+    Args:
+        storage_fn (Callable): Callback accepting rgd as a keyword argument
+        rgd (ResponseGetDataCrawler): The crawl result to store
+
+    Returns:
+        Whatever storage_fn returns
+    """
+    if asyncio.iscoroutinefunction(storage_fn):
+        return await storage_fn(rgd=rgd)
+
+    return await asyncio.get_running_loop().run_in_executor(
+        _io_executor, partial(storage_fn, rgd=rgd)
+    )
+
+
+def log_summary(results: Union[list, int]):
     """
     Logs the summary of the crawl operation.
 
     Args:
-        results (list): List of successfully crawled pages.
+        results (list | int): Successfully crawled pages, or their count.
     """
-    msg = f"Crawl completed successfully with {len(results)} pages crawled"
+    page_total = results if isinstance(results, int) else len(results)
+
+    msg = f"Crawl completed successfully with {page_total} pages crawled"
     logger.info(msg)
 
 
+async def get_shared_crawler(
+    browser_config: Optional[BrowserConfig] = None,
+) -> AsyncWebCrawler:
+    """
+    Returns a started AsyncWebCrawler from the running loop's pool, launching one if needed.
+
+    Crawlers are keyed by BrowserConfig identity (or by profile directory for
+    persistent profiles, which a single browser must own) so repeated crawl_url
+    calls reuse one Chromium instance instead of launching and tearing down a
+    browser per URL. Call close_shared_crawlers() on shutdown to release the
+    browsers and their profiles.
+
+    Args:
+        browser_config (BrowserConfig, optional): Browser settings; defaults to
+            create_default_browser_config().
+
+    Returns:
+        AsyncWebCrawler: A started crawler instance
+    """
+    browser_config = browser_config or create_default_browser_config()
+
+    if getattr(browser_config, "use_persistent_context", False):
+        key = browser_config.user_data_dir or id(browser_config)
+    else:
+        key = id(browser_config)
+
+    state = _get_loop_state()
+
+    async with state.crawler_pool_lock:
+        entry = state.crawler_pool.get(key)
+
+        if entry is None:
+            started_config, profile_dir = claim_browser_profile(browser_config)
+            crawler = AsyncWebCrawler(config=started_config)
+
+            try:
+                await crawler.__aenter__()
+            except BaseException:
+                release_browser_profile(profile_dir)
+                raise
+
+            # keep a reference to the config so its id cannot be reused while pooled
+            entry = state.crawler_pool[key] = (browser_config, crawler, profile_dir)
+            logger.debug("Started pooled crawler for browser config %s", key)
+
+    return entry[1]
+
+
+async def close_shared_crawlers():
+    """Closes every AsyncWebCrawler pooled by get_shared_crawler on the running loop."""
+    state = _get_loop_state()
+
+    async with state.crawler_pool_lock:
+        entries = list(state.crawler_pool.values())
+        state.crawler_pool.clear()
+
+    for _, crawler, profile_dir in entries:
+        try:
+            await crawler.__aexit__(None, None, None)
+        except Exception as e:
+            logger.warning("Error closing pooled crawler: %s", str(e))
+        finally:
+            release_browser_profile(profile_dir)
+
+
 async def crawl_url(
     url: str,
     session_id: str = None,
@@ -138,65 +1101,266 @@ async def crawl_url(
     timeout: int = 15,
     logs=None,
     is_recrawl=False,
+    crawler: Optional[AsyncWebCrawler] = None,
 ) -> ResponseGetDataCrawler:
     """
     Scrapes a single URL and processes the result.
+
+    If no crawler is provided, a pooled crawler for browser_config is reused
+    (see get_shared_crawler) rather than launching a new browser per call.
+
+    Concurrent calls for the same URL with the same storage_fn, process_fn,
+    logs and is_recrawl share a single fetch: later callers await the in-flight
+    result instead of crawling (and storing/processing) it again. Calls that
+    differ in any of those run their own crawl so their callbacks and logs are
+    never skipped.
     """
-    logs = logs or {"success": [], "failed": []}
+    state = _get_loop_state()
+
+    # the owner keeps the callbacks and logs alive, so their ids stay unique
+    key = (url, id(storage_fn), id(process_fn), id(logs), is_recrawl)
+
+    while True:
+        async with state.inflight_lock:
+            future = state.inflight.get(key)
+            is_owner = future is None
+
+            if is_owner:
+                future = state.inflight[key] = (
+                    asyncio.get_running_loop().create_future()
+                )
+
+        if is_owner:
+            break
+
+        try:
+            return await asyncio.shield(future)
+
+        except asyncio.CancelledError:
+            # the owner was cancelled, not us; crawl the URL ourselves
+            if future.cancelled() and not asyncio.current_task().cancelling():
+                continue
+            raise
+
+    try:
+        rgd = await _crawl_url(
+            url=url,
+            session_id=session_id,
+            browser_config=browser_config,
+            crawler_config=crawler_config,
+            storage_fn=storage_fn,
+            process_fn=process_fn,
+            timeout=timeout,
+            logs=logs,
+            is_recrawl=is_recrawl,
+            crawler=crawler,
+        )
+        future.set_result(rgd)
+        return rgd
+
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+
+    except BaseException as e:
+        future.set_exception(e)
+        future.exception()  # mark retrieved; the owner re-raises below
+        raise
+
+    finally:
+        state.inflight.pop(key, None)
+
+
+async def _crawl_url(
+    url: str,
+    session_id: str,
+    browser_config: Optional[BrowserConfig],
+    crawler_config: Optional[CrawlerRunConfig],
+    storage_fn: Optional[Callable],
+    process_fn: Optional[Callable],
+    timeout: int,
+    logs,
+    is_recrawl: bool,
+    crawler: Optional[AsyncWebCrawler],
+) -> ResponseGetDataCrawler:
+    """Performs the fetch, storage and processing for crawl_url."""
+    logs = init_crawl_logs(logs)
 
     if url in logs["success"] and not is_recrawl:
-        if url in logs["failed"]:
-            logs["failed"].remove(url)
+        logs["failed"].discard(url)
         return "no need to recrawl, already successful"  # Skip if already successful and not a recrawl
 
     # Use provided config or create default
-    browser_config = browser_config or create_default_browser_config()
+    browser_config = browser_config or create_default_browser_config(
+        session_id=session_id
+    )
     crawler_config = crawler_config or create_default_crawler_config()
 
     msg = f"Scraping URL: {url} with session ID: {session_id}"
     logger.info(msg)
 
-    # Check if crawl4ai is available before attempting to use it
+    # Reuse a running browser; browser cleanup happens in close_shared_crawlers
+    crawler = crawler or await get_shared_crawler(browser_config)
 
-    # Create a new crawler instance using the context manager pattern
-    # This ensures proper cleanup of browser resources after crawling
-    async with AsyncWebCrawler(config=browser_config) as crawler:
-        # Execute the crawling operation
+    # Execute the crawling operation
+    res = await crawler.arun(
+        url=url,
+        config=crawler_config,
+        session_id=session_id,  # Session ID for potential caching/resuming
+        timeout=timeout,  # Maximum time to wait for page load
+    )
 
-        res = await crawler.arun(
-            url=url,
-            config=crawler_config,
-            session_id=session_id,  # Session ID for potential caching/resuming
-            timeout=timeout,  # Maximum time to wait for page load
-        )
+    # Check if the crawl was successful
+    # Different errors can occur: network issues, timeouts, invalid URLs
+    rgd = ResponseGetDataCrawler.from_res(res)
 
-        # Check if the crawl was successful
-        # Different errors can occur: network issues, timeouts, invalid URLs
-        rgd = ResponseGetDataCrawler.from_res(res)
+    if not rgd.is_success:
+        logs["failed"].add(url)
 
-        if not rgd.is_success:
-            if url not in logs["failed"]:
-                logs["failed"].append(url)
+        return rgd
 
-            return rgd
+    # Execute optional callback functions if provided
+    # storage_fn: typically saves results to database or filesystem
+    if storage_fn:
+        await run_storage_fn(storage_fn, rgd)
 
-        # Execute optional callback functions if provided
-        # storage_fn: typically saves results to database or filesystem
-        if storage_fn:
-            storage_fn(rgd=rgd)
+    # process_fn: typically transforms or extracts data from results
+    if process_fn:
+        await process_fn(rgd)
 
-        # process_fn: typically transforms or extracts data from results
-        if process_fn:
-            await process_fn(rgd)
+    # Return the standardized response
 
-        # Return the standardized response
+    logs["failed"].discard(url)
 
-        if url in logs["failed"]:
-            logs["failed"].remove(url)
+    logs["success"].add(url)
+    return rgd
 
-        if url not in logs["success"]:
-            logs["success"].append(url)
-        return rgd
+
+async def stream_crawl_urls(
+    starting_url: str,
+    session_id: str,
+    crawler_config: Optional[CrawlerRunConfig] = None,
+    browser_config: Optional[BrowserConfig] = None,
+    storage_fn: Optional[Callable] = None,
+    process_fn: Optional[Callable] = None,
+    delay_before_return_html: int = 3,
+    logs=None,
+    is_recrawl: bool = False,
+    process_workers: int = 4,
+    queue_maxsize: int = 64,
+    process_semaphore: Optional[asyncio.Semaphore] = None,
+    return_full: bool = False,
+) -> AsyncIterator[ResponseGetDataCrawler]:
+    """
+    Crawls multiple URLs starting from an initial URL, yielding pages as they finish.
+
+    The deep crawl always runs in crawl4ai's stream mode and nothing is
+    retained here, so memory stays flat regardless of how many pages are
+    crawled; the caller decides what to keep.
+
+    Crawl results are handed to process_fn through a bounded queue drained by
+    process_workers consumers, so processing (e.g. embedding) overlaps with
+    fetching the next pages. The queue bound applies backpressure to the crawl
+    when processing (or the caller) falls behind.
+
+    Args:
+        process_workers (int): Number of concurrent process_fn consumers
+        queue_maxsize (int): Maximum crawl results buffered ahead of processing
+        process_semaphore (asyncio.Semaphore): Optional limit shared with other
+            callers, for rate-limited process_fn implementations
+        return_full (bool): Keep page content on yielded results; by default
+            it is released once storage_fn and process_fn are done with it
+
+    Yields:
+        ResponseGetDataCrawler: Each successfully stored and processed page
+    """
+    logs = init_crawl_logs(logs)
+
+    # Use provided config or create default
+    browser_config = browser_config or create_default_browser_config(
+        session_id=session_id
+    )
+    crawler_config = (crawler_config or create_default_crawler_config()).clone(
+        stream=True
+    )
+
+    msg = f"Starting crawl from URL: {starting_url} with session ID: {session_id}"
+    logger.info(msg)
+
+    queue: asyncio.Queue = asyncio.Queue(maxsize=queue_maxsize)
+    processed: asyncio.Queue = asyncio.Queue(maxsize=queue_maxsize)
+
+    workers = [
+        asyncio.create_task(
+            _consume_crawl_results(
+                queue=queue,
+                processed=processed,
+                process_fn=process_fn,
+                session_id=session_id,
+                logs=logs,
+                semaphore=process_semaphore,
+                return_full=return_full,
+            )
+        )
+        for _ in range(max(1, process_workers) if process_fn else 1)
+    ]
+
+    async def _run() -> int:
+        try:
+            page_count = await _produce_crawl_results(
+                queue=queue,
+                starting_url=starting_url,
+                session_id=session_id,
+                browser_config=browser_config,
+                crawler_config=crawler_config,
+                storage_fn=storage_fn,
+                delay_before_return_html=delay_before_return_html,
+                logs=logs,
+                is_recrawl=is_recrawl,
+            )
+
+            for _ in workers:
+                await queue.put(None)
+
+            await asyncio.gather(*workers)
+            return page_count
+
+        finally:
+            for worker in workers:
+                worker.cancel()
+
+    runner = asyncio.create_task(_run())
+    yielded_count = 0
+
+    try:
+        while True:
+            getter = asyncio.ensure_future(processed.get())
+            await asyncio.wait({getter, runner}, return_when=asyncio.FIRST_COMPLETED)
+
+            if getter.done():
+                yielded_count += 1
+                yield getter.result()
+                continue
+
+            getter.cancel()
+
+            # The crawl finished; hand over anything still buffered
+            while not processed.empty():
+                yielded_count += 1
+                yield processed.get_nowait()
+
+            break
+
+        page_count = runner.result()
+
+    finally:
+        if not runner.done():
+            runner.cancel()
+            await asyncio.gather(runner, return_exceptions=True)
+
+    await alog_progress(logs, session_id, page_count)
+    close_event_log(session_id)
+    log_summary(yielded_count)
 
 
 async def crawl_urls(
@@ -209,71 +1373,282 @@ async def crawl_urls(
     delay_before_return_html: int = 3,
     logs=None,
     is_recrawl: bool = False,
+    process_workers: int = 4,
+    queue_maxsize: int = 64,
+    process_semaphore: Optional[asyncio.Semaphore] = None,
+    max_results_retained: Optional[int] = None,
+    return_full: bool = False,
 ) -> List[ResponseGetDataCrawler]:
     """
-    Crawls multiple URLs starting from an initial URL.
+    Crawls multiple URLs starting from an initial URL and collects the results.
+
+    Thin wrapper around stream_crawl_urls for callers that want a list. Pages
+    are already stored and processed as they stream, so long crawls can cap
+    memory with max_results_retained (keep only the most recent N pages) or
+    iterate stream_crawl_urls directly.
 
+    Args:
+        max_results_retained (int, optional): Keep at most this many of the
+            most recent results; None keeps everything, 0 keeps nothing.
+        return_full (bool): Keep page content on the returned results.
     """
-    logs = logs or {"success": [], "failed": []}
+    results: Deque[ResponseGetDataCrawler] = deque(maxlen=max_results_retained)
+
+    async for rgd in stream_crawl_urls(
+        starting_url=starting_url,
+        session_id=session_id,
+        crawler_config=crawler_config,
+        browser_config=browser_config,
+        storage_fn=storage_fn,
+        process_fn=process_fn,
+        delay_before_return_html=delay_before_return_html,
+        logs=logs,
+        is_recrawl=is_recrawl,
+        process_workers=process_workers,
+        queue_maxsize=queue_maxsize,
+        process_semaphore=process_semaphore,
+        return_full=return_full,
+    ):
+        results.append(rgd)
 
-    # Use provided config or create default
-    browser_config = browser_config or create_default_browser_config()
-    crawler_config = crawler_config or create_default_crawler_config()
+    return list(results)
 
-    msg = f"Starting crawl from URL: {starting_url} with session ID: {session_id}"
+
+async def _consume_crawl_results(
+    queue: asyncio.Queue,
+    processed: asyncio.Queue,
+    process_fn: Optional[Callable],
+    session_id: str,
+    logs: dict,
+    semaphore: Optional[asyncio.Semaphore] = None,
+    return_full: bool = False,
+):
+    """Drains crawl results from the queue until a None sentinel arrives."""
+    while True:
+        rgd = await queue.get()
+
+        try:
+            if rgd is None:
+                return
+
+            if process_fn:
+                try:
+                    if semaphore:
+                        async with semaphore:
+                            await process_fn(rgd=rgd)
+                    else:
+                        await process_fn(rgd=rgd)
+
+                except Exception as e:
+                    logger.error(f"Error processing {rgd.url}: {e}")
+                    logs["failed"].add(rgd.url)
+                    log_event(session_id, rgd.url, "failed")
+                    continue
+
+            logs["success"].add(rgd.url)
+
+            logs["failed"].discard(rgd.url)
+            log_event(session_id, rgd.url, "success")
+
+            if not return_full:
+                rgd.release_buffers()
+
+            await processed.put(rgd)
+
+        finally:
+            queue.task_done()
+
+
+async def _produce_crawl_results(
+    queue: asyncio.Queue,
+    starting_url: str,
+    session_id: str,
+    browser_config: BrowserConfig,
+    crawler_config: CrawlerRunConfig,
+    storage_fn: Optional[Callable],
+    delay_before_return_html: int,
+    logs: dict,
+    is_recrawl: bool,
+) -> int:
+    """Runs the deep crawl, storing each new page and queueing it for processing."""
+    page_count = 0
+
+    # the profile is claimed for this crawler only, and released when it closes
+    browser_config, profile_dir = claim_browser_profile(browser_config)
+
+    try:
+        async with AsyncWebCrawler(config=browser_config) as crawler:
+            msg = f"Initializing multi-page crawl from {starting_url}"
+            logger.debug(msg)
+
+            seen_urls: set = set()
+
+            async for res in await crawler.arun(
+                url=starting_url,  # Start crawling from the initial URL
+                # dispatche=dispatcher,  # Use the adaptive dispatcher for rate limiting and memory management
+                config=crawler_config,
+                magic=True,  # Enable magic mode for automatic content extraction
+                delay_before_return_html=delay_before_return_html,  # Wait time for dynamic content loading
+                session_id=session_id,  # For tracking and resuming crawls
+            ):
+
+                page_count += 1
+                current_url = getattr(res, "url", "unknown")
+
+                msg = f"Processing crawl result #{page_count} for URL: {current_url}"
+                logger.debug(msg)
+
+                if current_url in logs["success"] and not is_recrawl:
+                    # Skip if already successful and not a recrawl; checked before
+                    # from_res so replayed pages are never parsed
+                    continue
+
+                rgd = ResponseGetDataCrawler.from_res(res)
+
+                if not rgd.is_success:
+                    logs["failed"].add(current_url)
+                    log_event(session_id, current_url, "failed")
+                    continue
+
+                # BFS can yield the same page more than once; skip duplicate storage/embedding work
+                if current_url in seen_urls:
+                    continue
+                seen_urls.add(current_url)
+
+                if storage_fn:
+                    await run_storage_fn(storage_fn, rgd)
+
+                await queue.put(rgd)
+
+                # Snapshot progress periodically
+                if page_count % PROGRESS_SNAPSHOT_INTERVAL == 0:
+                    await alog_progress(logs, session_id, page_count)
+
+                if page_count % GC_COLLECT_INTERVAL == 0:
+                    gc.collect()
+
+    finally:
+        release_browser_profile(profile_dir)
+
+    return page_count
+
+
+async def crawl_urls_batch(
+    urls: List[str],
+    session_id: str,
+    crawler_config: Optional[CrawlerRunConfig] = None,
+    browser_config: Optional[BrowserConfig] = None,
+    storage_fn: Optional[Callable] = None,
+    process_fn: Optional[Callable] = None,
+    logs=None,
+    is_recrawl: bool = False,
+    dispatcher: Optional[MemoryAdaptiveDispatcher] = None,
+    crawler: Optional[AsyncWebCrawler] = None,
+    concurrency_controller: Optional[AIMDConcurrencyController] = None,
+    return_full: bool = False,
+) -> List[ResponseGetDataCrawler]:
+    """
+    Crawls a list of independent URLs concurrently using arun_many.
+
+    Requests are scheduled by a MemoryAdaptiveDispatcher (rate limited, memory
+    bounded) and results are streamed back so storage_fn / process_fn run as each
+    page completes rather than after the whole batch. Dispatcher concurrency is
+    tuned per result by an AIMDConcurrencyController.
+
+    Page content is released from each result once storage_fn / process_fn
+    have run unless return_full is set; the returned results keep url and status.
+    """
+    logs = init_crawl_logs(logs)
+
+    urls = [url for url in urls if is_recrawl or url not in logs["success"]]
+
+    if not urls:
+        return []
+
+    # Use provided config or create default; arun_many must stream for async iteration
+    browser_config = browser_config or create_default_browser_config(
+        session_id=session_id
+    )
+    crawler_config = (crawler_config or create_default_crawler_config()).clone(
+        stream=True
+    )
+    dispatcher = dispatcher or generate_async_dispatcher()
+    concurrency_controller = concurrency_controller or AIMDConcurrencyController(
+        dispatcher=dispatcher,
+        max_concurrency=max(dispatcher.max_session_permit, 1),
+    )
+    crawler = crawler or await get_shared_crawler(browser_config)
+
+    msg = f"Starting batch crawl of {len(urls)} URLs with session ID: {session_id}"
     logger.info(msg)
 
     results = []
+    page_count = 0
 
-    async with AsyncWebCrawler(config=browser_config) as crawler:
-        msg = f"Initializing multi-page crawl from {starting_url}"
-        logger.debug(msg)
-
-        page_count = 0
+    memory_monitor = asyncio.create_task(
+        monitor_memory_pressure(dispatcher, concurrency_controller)
+    )
 
-        async for res in await crawler.arun(
-            url=starting_url,  # Start crawling from the initial URL
-            # dispatche=dispatcher,  # Use the adaptive dispatcher for rate limiting and memory management
-            config=crawler_config,
-            magic=True,  # Enable magic mode for automatic content extraction
-            delay_before_return_html=delay_before_return_html,  # Wait time for dynamic content loading
-            session_id=session_id,  # For tracking and resuming crawls
+    try:
+        async for res in await crawler.arun_many(
+            urls=urls, config=crawler_config, dispatcher=dispatcher
         ):
-
             page_count += 1
             current_url = getattr(res, "url", "unknown")
 
-            msg = f"Processing crawl result #{page_count} for URL: {current_url}"
-            logger.debug(msg)
-            rgd = ResponseGetDataCrawler.from_res(res)
+            concurrency_controller.record(res)
 
-            if not rgd.is_success:
-                if current_url not in logs["failed"]:
-                    logs["failed"].append(current_url)
+            rate_limiter = getattr(dispatcher, "rate_limiter", None)
+            if isinstance(rate_limiter, HeaderAwareRateLimiter):
+                rate_limiter.observe_headers(
+                    current_url, getattr(res, "response_headers", None)
+                )
 
-                log_progress(logs, session_id=session_id, page_count=page_count)
-                continue
+            rgd = ResponseGetDataCrawler.from_res(res)
 
-            if current_url in logs["success"] and not is_recrawl:
-                # Skip if already successful and not a recrawl
+            if not rgd.is_success:
+                logs["failed"].add(current_url)
+                log_event(session_id, current_url, "failed")
                 continue
 
             if storage_fn:
-                storage_fn(rgd=rgd)
+                await run_storage_fn(storage_fn, rgd)
 
             if process_fn:
-                await process_fn(rgd=rgd)
+                try:
+                    await process_fn(rgd=rgd)
+
+                except Exception as e:
+                    logger.error(f"Error processing {current_url}: {e}")
+                    logs["failed"].add(current_url)
+                    log_event(session_id, current_url, "failed")
+                    continue
+
+            if not return_full:
+                rgd.release_buffers()
 
             results.append(rgd)
-            logs["success"].append(current_url)
 
-            if current_url in logs["failed"]:
-                logs["failed"].remove(current_url)
+            logs["success"].add(current_url)
+
+            logs["failed"].discard(current_url)
+            log_event(session_id, current_url, "success")
+
+            # Snapshot progress periodically
+            if page_count % PROGRESS_SNAPSHOT_INTERVAL == 0:
+                await alog_progress(logs, session_id, page_count)
+
+            if page_count % GC_COLLECT_INTERVAL == 0:
+                gc.collect()
+
+    finally:
+        memory_monitor.cancel()
+        (monitor_result,) = await asyncio.gather(memory_monitor, return_exceptions=True)
 
-            # Log progress periodically
-            if page_count % 10 == 0:
-                log_progress(logs, session_id, page_count)
+        if isinstance(monitor_result, Exception):
+            logger.warning("Memory pressure monitor failed: %s", monitor_result)
 
-        log_progress(logs, session_id, page_count)
-        log_summary(results)
+    await alog_progress(logs, session_id, page_count)
+    close_event_log(session_id)
+    log_summary(results)
     return results
@@ -1,41 +1,97 @@
 # Standard library imports
-import json
+import asyncio
+import logging
+import os
 from dataclasses import dataclass
-from typing import Union, Dict, List, Literal
+from functools import cached_property, lru_cache
+from typing import AsyncIterator, Union, Dict, List, Literal
 
 # Third-party imports
+import httpx
 from openai import AsyncClient as AsyncOpenaiClient
 
 # Local application imports
 from client.ResponseGetData import ResponseGetDataOpenAi
+import utils.convert as utcv
 
+logger = logging.getLogger(__name__)
 
+# Upper bound on chat completions in flight for one generate_openai_chats call
+OPENAI_CONCURRENCY = int(os.getenv("OPENAI_CONCURRENCY", "16"))
+
+# Clients handed out by generate_openai_client, closed by close_openai_clients
+_openai_clients: List[AsyncOpenaiClient] = []
+
+
+def generate_http_client(
+    max_connections: int = 100,
+    max_keepalive_connections: int = 20,
+    timeout: float = 60.0,
+) -> httpx.AsyncClient:
+    """Creates a pooled HTTPX transport so TLS connections are reused across calls."""
+    return httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+        ),
+        timeout=httpx.Timeout(timeout),
+    )
+
+
+@lru_cache(maxsize=4)
 def generate_openai_client(
     api_key: str, base_url: str = None, is_ollama: bool = False
 ) -> AsyncOpenaiClient:
+    """
+    Returns a shared OpenAI client for the given credentials.
+
+    Clients are memoized on (api_key, base_url, is_ollama) and share a pooled
+    HTTPX transport, so repeated calls reuse open connections instead of paying
+    a TLS handshake each time. Call close_openai_clients on shutdown.
+    """
 
     if is_ollama:
-        return AsyncOpenaiClient(
+        client = AsyncOpenaiClient(
             api_key=api_key,
             base_url=base_url,
+            http_client=generate_http_client(),
         )
 
-    return AsyncOpenaiClient(api_key=api_key)
+    else:
+        client = AsyncOpenaiClient(api_key=api_key, http_client=generate_http_client())
 
+    _openai_clients.append(client)
+    return client
 
-@dataclass
+
+async def close_openai_clients():
+    """Closes every client created by generate_openai_client and clears the cache."""
+    while _openai_clients:
+        await _openai_clients.pop().close()
+
+    generate_openai_client.cache_clear()
+
+
+@dataclass(frozen=True)
 class ChatMessage:
     """
     Data class representing a message in a chat conversation.
+
+    Messages are immutable so their serialized form can be computed once and
+    reused every time the conversation is sent.
     """
 
     role: Literal["user", "model", "system", "ai"]
     content: str
     timestamp: str = None
 
-    def to_json(self):
+    @cached_property
+    def as_json(self) -> Dict[str, str]:
         return {"role": self.role, "content": self.content, "timestamp": self.timestamp}
 
+    def to_json(self):
+        return self.as_json
+
 
 async def generate_openai_chat(
     async_client: AsyncOpenaiClient,
@@ -43,12 +99,32 @@ async def generate_openai_chat(
     model: str = None,
     response_format: Union[Dict[str, str], None] = None,
     return_raw: bool = False,
+    stream: bool = False,
 ):
+    """
+    Sends a chat completion request.
+
+    With stream=True the completion is requested as a stream and an async
+    generator is returned instead of a ResponseGetDataOpenAi; see
+    stream_openai_chat_deltas.
+    """
+
     # Convert all messages to the proper format expected by OpenAI
     clean_message = [
-        msg.to_json() if isinstance(msg, ChatMessage) else msg for msg in messages
+        msg.as_json if isinstance(msg, ChatMessage) else msg for msg in messages
     ]
 
+    is_json = bool(response_format and response_format.get("type") == "json_object")
+
+    if stream:
+        res = await async_client.chat.completions.create(
+            model=model,
+            messages=clean_message,
+            response_format=response_format,
+            stream=True,
+        )
+        return stream_openai_chat_deltas(res, is_json=is_json)
+
     # Make the API call to OpenAI
     res = await async_client.chat.completions.create(
         model=model, messages=clean_message, response_format=response_format
@@ -66,12 +142,126 @@ async def generate_openai_chat(
     rgd.response = content
 
     # Parse JSON if the response is in JSON format
-    if response_format and response_format.get("type") == "json_object":
-        rgd.response = json.loads(content)
+    if is_json:
+        rgd.response = utcv.json_loads(content)
 
     return rgd
 
 
+async def generate_openai_chats(
+    async_client: AsyncOpenaiClient,
+    messages_ls: List[List[ChatMessage]],
+    model: str = None,
+    response_format: Union[Dict[str, str], None] = None,
+    return_raw: bool = False,
+    max_concurrent_requests: int = None,
+) -> List[ResponseGetDataOpenAi]:
+    """
+    Sends several independent chat completion requests concurrently.
+
+    Awaiting generate_openai_chat in a loop pays one full round trip per
+    prompt; here the requests overlap, bounded by max_concurrent_requests
+    (default OPENAI_CONCURRENCY) to stay within rate limits. Results are
+    returned in the order of messages_ls.
+
+    Args:
+        async_client (AsyncOpenaiClient): OpenAI client
+        messages_ls (List[List[ChatMessage]]): One conversation per request
+        max_concurrent_requests (int): Maximum number of requests in flight
+    """
+
+    semaphore = asyncio.Semaphore(max_concurrent_requests or OPENAI_CONCURRENCY)
+
+    async def _chat(messages: List[ChatMessage]) -> ResponseGetDataOpenAi:
+        async with semaphore:
+            return await generate_openai_chat(
+                async_client=async_client,
+                messages=messages,
+                model=model,
+                response_format=response_format,
+                return_raw=return_raw,
+            )
+
+    return await asyncio.gather(*[_chat(messages) for messages in messages_ls])
+
+
+async def stream_openai_chat_deltas(
+    res: AsyncIterator, is_json: bool = False
+) -> AsyncIterator[Union[str, dict]]:
+    """
+    Yields content from a streamed chat completion as it arrives.
+
+    Text responses yield each content delta. JSON responses can't be parsed
+    until complete, so the deltas are buffered and the parsed object is
+    yielded once at the end.
+
+    Args:
+        res: Stream returned by chat.completions.create(stream=True)
+        is_json (bool): Whether the response_format was json_object
+    """
+    buffer = []
+
+    async for chunk in res:
+        if not chunk.choices:
+            continue
+
+        delta = chunk.choices[0].delta.content
+        if not delta:
+            continue
+
+        if is_json:
+            buffer.append(delta)
+            continue
+
+        yield delta
+
+    if is_json:
+        yield utcv.json_loads("".join(buffer))
+
+
+async def generate_openai_embeddings(
+    texts: List[str],
+    async_client: AsyncOpenaiClient,
+    model: str = "text-embedding-3-small",
+    batch_size: int = 96,
+    max_concurrent_requests: int = 4,
+    debug_prn: bool = False,
+) -> List[List[float]]:
+    """
+    Generates embeddings for many texts with one API request per batch.
+
+    Batches are sent concurrently (bounded by max_concurrent_requests to stay
+    within rate limits) and the returned vectors preserve the order of texts.
+
+    Args:
+        texts (List[str]): Texts to embed
+        async_client (AsyncOpenaiClient): OpenAI client
+        model (str): Embedding model name
+        batch_size (int): Maximum number of texts per API request
+        max_concurrent_requests (int): Maximum number of batches in flight
+
+    Returns:
+        List[List[float]]: One embedding vector per input text
+    """
+
+    if debug_prn:
+        logger.info("📚 - starting LLM embedding generation for %d texts", len(texts))
+
+    batches = [texts[i : i + batch_size] for i in range(0, len(texts), batch_size)]
+    semaphore = asyncio.Semaphore(max_concurrent_requests)
+
+    async def _embed_batch(batch: List[str]) -> List[List[float]]:
+        async with semaphore:
+            res = await async_client.embeddings.create(model=model, input=batch)
+
+        # The API returns vectors in input order; sort by index defensively
+        return [d.embedding for d in sorted(res.data, key=lambda d: d.index)]
+
+    batch_results = await asyncio.gather(*[_embed_batch(batch) for batch in batches])
+
+    return [embedding for batch in batch_results for embedding in batch]
+
+
 async def generate_openai_embedding(
     text: str,
     async_client: AsyncOpenaiClient,
@@ -80,16 +270,13 @@ async def generate_openai_embedding(
     debug_prn: bool = False,
 ) -> List[float]:
 
-    # Print debug information if requested
-    if debug_prn:
-        print("📚 - starting LLM embedding generation")
-
-    # Generate embeddings via the OpenAI API
-    res = await async_client.embeddings.create(model=model, input=text)
-
-    # Return the raw response if requested
+    # Return the raw API response if requested
     if return_raw:
-        return res
+        return await async_client.embeddings.create(model=model, input=text)
+
+    # Otherwise, delegate to the batched implementation with a single text
+    embeddings = await generate_openai_embeddings(
+        texts=[text], async_client=async_client, model=model, debug_prn=debug_prn
+    )
 
-    # Otherwise, extract and return just the embedding vector
-    return res.data[0].embedding
+    return embeddings[0]
@@ -1,17 +1,46 @@
 # Standard library imports
-import json
+import os
+import math
+import struct
+import time
+import hashlib
+import asyncio
+import weakref
 import logging
 import datetime as dt
-from typing import List, Dict, Callable, Optional, Any, Union
-
-from supabase import AsyncClient as AsyncSupabaseClient
+from collections import deque
+from dataclasses import dataclass, field
+from operator import itemgetter
+from typing import (
+    AsyncIterator,
+    List,
+    Dict,
+    Callable,
+    Deque,
+    Iterable,
+    Optional,
+    Any,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+import httpx
+import ijson
+from cachetools import TTLCache
+from supabase import AsyncClient as AsyncSupabaseClient, create_async_client
+from supabase.lib.client_options import AsyncClientOptions
 
 # Local application imports
 from client.MafiaError import MafiaError
 from client.ResponseGetData import ResponseGetDataSupabase
 
-from utils.files import upsert_folder
-from utils.convert import convert_url_to_file_name, sanitize_frontmatter_value
+from utils.files import atomic_write, upsert_folder
+from utils.convert import (
+    convert_url_to_file_name,
+    json_dumps,
+    sanitize_frontmatter_value,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -25,50 +54,226 @@ class SupabaseError(MafiaError):
         super().__init__(message=message, exception=exception)
 
 
+# Caps concurrent PostgREST requests; keep in line with make_supabase_client's pool
+SUPABASE_MAX_INFLIGHT = int(os.getenv("SUPABASE_MAX_INFLIGHT", "5"))
+
+
+@dataclass
+class _LoopState:
+    """
+    Per-event-loop connection state.
+
+    asyncio primitives, futures and pooled httpx connections are bound to the
+    loop that first uses them, so sharing them module-wide breaks as soon as a
+    second loop appears (e.g. one loop per Streamlit session or asyncio.run
+    per call).
+    """
+
+    query_sem: asyncio.Semaphore = field(
+        default_factory=lambda: asyncio.Semaphore(SUPABASE_MAX_INFLIGHT)
+    )
+
+    # One client per loop; each new client pays a TLS + auth handshake
+    client: Optional[AsyncSupabaseClient] = None
+    client_lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+    # Document queries currently running, keyed by (table_name, url, source)
+    url_inflight: Dict[tuple, asyncio.Future] = field(default_factory=dict)
+
+
+_loop_states: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopState]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _get_loop_state() -> _LoopState:
+    """Return the connection state for the running event loop, creating it once."""
+    loop = asyncio.get_running_loop()
+    state = _loop_states.get(loop)
+
+    if state is None:
+        state = _loop_states[loop] = _LoopState()
+
+    return state
+
+
+# Short-lived read caches; keys start with table_name so writes can evict them
+_url_cache: TTLCache = TTLCache(maxsize=1024, ttl=60)  # (table_name, source)
+_doc_cache: TTLCache = TTLCache(maxsize=2048, ttl=30)  # (table_name, url, source)
+# (table_name, match_count, source, embedding fingerprint)
+_chunks_cache: TTLCache = TTLCache(maxsize=512, ttl=120)
+
+
+def invalidate_caches(table_name: Optional[str] = None) -> None:
+    """
+    Evict cached reads for a table, or for every table when table_name is None.
+
+    Called by store_data_in_supabase_table after a successful upsert so later
+    reads see the new rows.
+    """
+    for cache in (_url_cache, _doc_cache, _chunks_cache):
+        if table_name is None:
+            cache.clear()
+            continue
+
+        for key in [key for key in list(cache.keys()) if key[0] == table_name]:
+            cache.pop(key, None)
+
+
+async def make_supabase_client(
+    url: Optional[str] = None,
+    key: Optional[str] = None,
+    *,
+    max_connections: int = 5,
+    max_keepalive_connections: int = 3,
+    keepalive_expiry: float = 1800,
+    timeout: float = 30,
+) -> AsyncSupabaseClient:
+    """
+    Create a Supabase client with a bounded HTTP connection pool.
+
+    httpx pools are unbounded by default, which lets a busy crawler run into
+    the Supabase pooler's connection cap; this caps open and idle connections
+    and recycles idle ones after keepalive_expiry seconds.
+
+    Args:
+        url: Project URL; defaults to SUPABASE_URL
+        key: Service key; defaults to SUPABASE_SERVICE_KEY
+        max_connections: Maximum concurrent HTTP connections
+        max_keepalive_connections: Maximum idle connections kept open
+        keepalive_expiry: Seconds before an idle connection is closed
+        timeout: PostgREST request timeout in seconds
+
+    Raises:
+        SupabaseError: If url or key is missing
+    """
+    url = url or os.environ.get("SUPABASE_URL")
+    key = key or os.environ.get("SUPABASE_SERVICE_KEY")
+
+    if not url or not key:
+        raise SupabaseError(
+            "SUPABASE_URL and SUPABASE_SERVICE_KEY must be set to create a Supabase client"
+        )
+
+    transport = httpx.AsyncHTTPTransport(
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+    )
+
+    options = AsyncClientOptions(
+        postgrest_client_timeout=timeout,
+        httpx_client=httpx.AsyncClient(transport=transport, timeout=timeout),
+    )
+
+    return await create_async_client(url, key, options=options)
+
+
+async def get_shared_client() -> AsyncSupabaseClient:
+    """
+    Return the shared Supabase client for the running event loop.
+
+    The client is built on first use by make_supabase_client from the
+    SUPABASE_URL and SUPABASE_SERVICE_KEY environment variables and reused by
+    every route on that loop that is not handed an explicit client. Its pooled
+    connections belong to the loop, so each loop gets its own client.
+
+    Raises:
+        SupabaseError: If the environment variables are missing
+    """
+    state = _get_loop_state()
+
+    if state.client is not None:
+        return state.client
+
+    async with state.client_lock:
+        if state.client is None:
+            state.client = await make_supabase_client()
+
+    return state.client
+
+
 async def store_data_in_supabase_table(
-    async_supabase_client: AsyncSupabaseClient,
+    async_supabase_client: Optional[AsyncSupabaseClient] = None,
+    *,
     table_name: str,
-    data: Dict[str, Any],
+    data: Union[Dict[str, Any], List[Dict[str, Any]]],
     on_conflict: str = "url, chunk_number",
+    batch_size: int = 100,
 ) -> ResponseGetDataSupabase:
     """
     Store data in a Supabase table using upsert operation.
 
+    A list of rows is sent as bulk upserts (one INSERT ... ON CONFLICT per
+    batch_size rows) rather than one request per row; batching keeps each
+    statement under Supabase's statement timeout.
+
     Args:
-        async_supabase_client: Initialized Supabase client
+        async_supabase_client: Supabase client; defaults to get_shared_client()
         table_name: Name of the table to store data in
-        data: Data dictionary to store
+        data: Data dictionary, or list of dictionaries, to store
         on_conflict: Comma-separated column names to check for conflicts
+        batch_size: Maximum number of rows per upsert request
 
     Returns:
-        ResponseGetDataSupabase: Standardized response object
+        ResponseGetDataSupabase: Standardized response object; for multiple
+            batches, response holds the rows returned by every batch
 
     Raises:
         SupabaseError: If the data cannot be stored
     """
 
+    if async_supabase_client is None:
+        async_supabase_client = await get_shared_client()
+
+    rows = [data] if isinstance(data, dict) else list(data)
+
+    if not rows:
+        return ResponseGetDataSupabase(is_success=True, status=200, response=[])
+
     try:
-        logger.debug("Storing data in table %s", table_name)
+        logger.debug("Storing %d rows in table %s", len(rows), table_name)
 
-        # Ensure async operation is awaited properly
-        res = await (
-            async_supabase_client.table(table_name)
-            .upsert(data, on_conflict=on_conflict)
-            .execute()
-        )
+        responses = []
 
-        # Convert result to standardized response format
-        response = ResponseGetDataSupabase.from_res(res=res)
+        for i in range(0, len(rows), batch_size):
+            # Ensure async operation is awaited properly
+            async with _get_loop_state().query_sem:
+                res = await (
+                    async_supabase_client.table(table_name)
+                    .upsert(rows[i : i + batch_size], on_conflict=on_conflict)
+                    .execute()
+                )
 
-        # Check for success
-        if not response.is_success:
-            error_msg = f"Failed to store data in {table_name} : {response.response}"
-            logger.error(error_msg)
-            raise SupabaseError(error_msg)
+            # Convert result to standardized response format
+            response = ResponseGetDataSupabase.from_res(res=res)
+
+            # Check for success; stop at the first failed batch
+            if not response.is_success:
+                error_msg = (
+                    f"Failed to store data in {table_name} : {response.response}"
+                )
+                logger.error(error_msg)
+                raise SupabaseError(error_msg)
+
+            responses.append(response)
 
-        msg = f"Successfully stored data in {table_name}"
+        msg = f"Successfully stored {len(rows)} rows in {table_name}"
         logger.info(msg)
-        return response
+
+        invalidate_caches(table_name)
+
+        if len(responses) == 1:
+            return responses[0]
+
+        return ResponseGetDataSupabase(
+            is_success=True,
+            status=200,
+            response=[row for response in responses for row in response.response],
+            raw=[response.raw for response in responses],
+        )
 
     except Exception as e:
         error_msg = f"Error storing data in Supabase table {table_name} : {str(e)}"
@@ -76,16 +281,213 @@ async def store_data_in_supabase_table(
         raise SupabaseError(error_msg, exception=e) from e
 
 
+class ChunkBatcher:
+    """
+    Buffers rows and upserts them in bulk across many producers.
+
+    process_rgd already stores one page per request, but most pages only
+    yield a few chunks; sharing a batcher across a crawl packs rows from many
+    pages into each upsert. The buffer is flushed once it holds max_rows rows
+    or its oldest row is max_wait seconds old (checked as rows are added), and
+    on exit.
+
+    Rows are keyed on the on_conflict columns, so a chunk re-added before a
+    flush replaces the buffered copy; Postgres rejects an upsert that touches
+    the same row twice.
+
+    If an upsert fails its rows go back into the buffer (without replacing
+    newer copies added meanwhile) so the next flush retries them, the error is
+    re-raised, and on_flush_error is called with the urls of the pages those
+    rows came from. Crawls record a page as successful once its rows are
+    handed to the batcher, so use on_flush_error to mark them failed again.
+
+    Usage:
+        async with ChunkBatcher(client, table_name="site_pages") as batcher:
+            await batcher.add(rows)
+    """
+
+    def __init__(
+        self,
+        async_supabase_client: Optional[AsyncSupabaseClient] = None,
+        *,
+        table_name: str,
+        on_conflict: str = "url, chunk_number",
+        max_rows: int = 50,
+        max_wait: float = 5.0,
+        on_flush_error: Optional[Callable[[List[str]], Any]] = None,
+    ):
+        self.async_supabase_client = async_supabase_client
+        self.table_name = table_name
+        self.on_conflict = on_conflict
+        self.max_rows = max_rows
+        self.max_wait = max_wait
+        self.on_flush_error = on_flush_error
+
+        self._key_fn = itemgetter(*[col.strip() for col in on_conflict.split(",")])
+        self._rows: Dict[Any, Dict[str, Any]] = {}
+        self._first_added: Optional[float] = None
+
+    async def add(self, data: Union[Dict[str, Any], List[Dict[str, Any]]]) -> None:
+        """Buffer one row or a list of rows, flushing if a threshold is reached."""
+        rows = [data] if isinstance(data, dict) else data
+
+        for row in rows:
+            self._rows[self._key_fn(row)] = row
+
+        if self._rows and self._first_added is None:
+            self._first_added = time.monotonic()
+
+        if len(self._rows) >= self.max_rows or (
+            self._first_added is not None
+            and time.monotonic() - self._first_added >= self.max_wait
+        ):
+            await self.flush()
+
+    async def flush(self) -> Optional[ResponseGetDataSupabase]:
+        """Upsert every buffered row; returns None when the buffer was empty."""
+        if not self._rows:
+            return None
+
+        # swap the buffer before awaiting so concurrent adds start a new batch
+        batch, self._rows = self._rows, {}
+        first_added, self._first_added = self._first_added, None
+
+        try:
+            return await store_data_in_supabase_table(
+                self.async_supabase_client,
+                table_name=self.table_name,
+                data=list(batch.values()),
+                on_conflict=self.on_conflict,
+            )
+
+        except BaseException:
+            # rows added while the upsert was in flight are newer; keep those
+            self._rows = {**batch, **self._rows}
+            self._first_added = min(first_added, self._first_added or first_added)
+
+            if self.on_flush_error:
+                self.on_flush_error(
+                    list(dict.fromkeys(row.get("url") for row in batch.values()))
+                )
+
+            raise
+
+    async def aclose(self) -> None:
+        await self.flush()
+
+    async def __aenter__(self) -> "ChunkBatcher":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.aclose()
+
+
+def _is_missing_function_error(e: Exception) -> bool:
+    """Return True if PostgREST rejected an RPC because the function is missing."""
+    return "PGRST202" in str(e) or "Could not find the function" in str(e)
+
+
+async def iter_document_urls_from_supabase(
+    async_supabase_client: Optional[AsyncSupabaseClient] = None,
+    source: Optional[str] = None,
+    table_name: str = "site_pages",
+    page: int = 1000,
+) -> AsyncIterator[str]:
+    """
+    Stream unique document URLs from Supabase, one page of rows at a time.
+
+    Deduplication and sorting happen in Postgres via the distinct_urls RPC
+    (sql/distinct_urls.sql), so only one row per document crosses the wire.
+    If the RPC has not been deployed, falls back to paging the table's url
+    column in order and skipping repeats. Pages are fetched with .range(),
+    keeping memory constant regardless of table size.
+
+    Args:
+        async_supabase_client: Supabase client; defaults to get_shared_client()
+        source: Optional metadata source filter
+        table_name: Name of the table to query
+        page: Number of rows fetched per request
+
+    Yields:
+        Unique document URLs in sorted order
+
+    Raises:
+        SupabaseError: If URLs cannot be retrieved
+    """
+
+    if async_supabase_client is None:
+        async_supabase_client = await get_shared_client()
+
+    msg = f"Retrieving document URLs from {table_name}" + (
+        f" with source '{source}'" if source else ""
+    )
+    logger.debug(msg)
+
+    use_rpc = True
+    last_url = None
+    offset = 0
+
+    while True:
+        if use_rpc:
+            query = async_supabase_client.rpc(
+                "distinct_urls", {"source": source, "table_name": table_name}
+            )
+        else:
+            query = (
+                async_supabase_client.table(table_name)
+                .select("url")
+                .order("url")
+                .order("chunk_number")
+            )
+            if source:
+                query = query.eq("metadata->>source", source)
+
+        try:
+            async with _get_loop_state().query_sem:
+                result = await query.range(offset, offset + page - 1).execute()
+
+        except Exception as e:
+            if use_rpc and offset == 0 and _is_missing_function_error(e):
+                logger.warning(
+                    "distinct_urls RPC is not deployed; paging %s rows instead",
+                    table_name,
+                )
+                use_rpc = False
+                continue
+
+            error_msg = f"Error retrieving document URLs : {str(e)}"
+            logger.error(error_msg)
+            raise SupabaseError(error_msg, exception=e) from e
+
+        rows = result.data or []
+
+        # Table rows repeat once per chunk but arrive in url order, so
+        # comparing against the previous url is enough to deduplicate
+        for doc in rows:
+            url = doc["url"]
+            if url != last_url:
+                last_url = url
+                yield url
+
+        if len(rows) < page:
+            break
+
+        offset += page
+
+
 async def get_document_urls_from_supabase(
-    async_supabase_client: AsyncSupabaseClient,
+    async_supabase_client: Optional[AsyncSupabaseClient] = None,
     source: Optional[str] = None,
     table_name: str = "site_pages",
 ) -> List[str]:
     """
     Retrieve a list of available document URLs from Supabase.
 
+    Collects iter_document_urls_from_supabase into a list; iterate that
+    directly to avoid materializing every URL.
+
     Args:
-        async_supabase_client: Initialized Supabase client
+        async_supabase_client: Supabase client; defaults to get_shared_client()
         source: Optional metadata source filter
         table_name: Name of the table to query
 
@@ -96,40 +498,26 @@ async def get_document_urls_from_supabase(
         SupabaseError: If URLs cannot be retrieved
     """
 
-    try:
-        msg = f"Retrieving document URLs from {table_name}" + (
-            f" with source '{source}'" if source else ""
-        )
-        logger.debug(msg)
+    cache_key = (table_name, source)
 
-        # Ensure async operation is awaited properly
-        if source:
-            result = await (
-                async_supabase_client.table(table_name)
-                .select("url")
-                .eq("metadata->>source", source)
-                .execute()
-            )
-        else:
-            result = await (
-                async_supabase_client.table(table_name).select("url").execute()
-            )
+    if cache_key in _url_cache:
+        return list(_url_cache[cache_key])
 
-        # Handle empty results
-        if not result.data:
-            logger.info("No document URLs found")
-            return []
+    urls = [
+        url
+        async for url in iter_document_urls_from_supabase(
+            async_supabase_client, source=source, table_name=table_name
+        )
+    ]
 
-        # Extract and deduplicate URLs
-        urls = sorted(set(doc["url"] for doc in result.data))
+    if not urls:
+        logger.info("No document URLs found")
+    else:
         msg = f"Retrieved {len(urls)} unique document URLs"
         logger.info(msg)
-        return urls
 
-    except Exception as e:
-        error_msg = f"Error retrieving document URLs : {str(e)}"
-        logger.error(error_msg)
-        raise SupabaseError(error_msg, exception=e) from e
+    _url_cache[cache_key] = urls
+    return list(urls)
 
 
 def format_supabase_chunks(data: List[Dict[str, Any]]) -> List[str]:
@@ -138,9 +526,14 @@ def format_supabase_chunks(data: List[Dict[str, Any]]) -> List[str]:
         logger.warning("Empty data provided to format_supabase_chunks")
         return []
 
+    # Bind dict.get once so the loop does no attribute lookups per row; an
+    # inline f-string compiles to a single BUILD_STRING, which measured faster
+    # than a %-template or map() over a helper
+    get = dict.get
+
     try:
         return [
-            f"# {doc.get('title', 'Untitled')}\n\n{doc.get('content', '')}"
+            f"# {get(doc, 'title', 'Untitled')}\n\n{get(doc, 'content', '')}"
             for doc in data
             if doc
         ]
@@ -149,6 +542,9 @@ def format_supabase_chunks(data: List[Dict[str, Any]]) -> List[str]:
         return [str(doc) for doc in data if doc]
 
 
+_get_content = itemgetter("content")
+
+
 def format_supabase_chunks_into_pages(data: List[dict]) -> str:
     """
     Format multiple Supabase chunks into a single page.
@@ -186,21 +582,28 @@ def format_supabase_chunks_into_pages(data: List[dict]) -> str:
         if " - " in page_title:
             page_title = page_title.split(" - ")[0]
 
-        # Format content with title and content from all chunks
-        formatted_content = [f"# {page_title}\n"]
-        for chunk in data:
-            content = chunk.get("content", "")
-            if content:
-                formatted_content.append(content)
+        # Join every non-empty content in C via map/filter; rows selected by
+        # get_document_from_supabase always carry content, so the .get path
+        # only runs for hand-built data
+        try:
+            body = "\n\n".join(filter(None, map(_get_content, data)))
+        except KeyError:
+            body = "\n\n".join(
+                filter(None, (chunk.get("content", "") for chunk in data))
+            )
+
+        if not body:
+            return f"# {page_title}\n"
 
-        return "\n\n".join(formatted_content)
+        return f"# {page_title}\n\n\n{body}"
     except Exception as e:
         logger.error(f"Error formatting page: {str(e)}")
         return "\n\n".join([chunk.get("content", "") for chunk in data if chunk])
 
 
 async def get_document_from_supabase(
-    async_supabase_client: AsyncSupabaseClient,
+    async_supabase_client: Optional[AsyncSupabaseClient] = None,
+    *,
     url: str,
     table_name: str = "site_pages",
     source: Optional[str] = None,
@@ -209,8 +612,11 @@ async def get_document_from_supabase(
     """
     Retrieve a document from Supabase by URL.
 
+    Relies on the (url, chunk_number) indexes in sql/site_pages_indexes.sql so
+    the chunk_number ordering is served by an index scan rather than a sort.
+
     Args:
-        async_supabase_client: Initialized Supabase client
+        async_supabase_client: Supabase client; defaults to get_shared_client()
         url: URL of the document to retrieve
         table_name: Name of the table to query
         source: Optional metadata source filter
@@ -222,8 +628,149 @@ async def get_document_from_supabase(
     Raises:
         SupabaseError: If document cannot be retrieved
     """
+    # Rows are cached rather than formatted output, so format_fn runs per call
+    key = (table_name, url, source)
+
+    if key in _doc_cache:
+        data = list(_doc_cache[key])
+        return format_fn(data) if format_fn else data
+
+    if async_supabase_client is None:
+        async_supabase_client = await get_shared_client()
+
+    # Concurrent requests for the same document share one query (and one
+    # pooled connection); later callers await the in-flight result. There is no
+    # await between the lookup and the insert, so no lock is needed.
+    url_inflight = _get_loop_state().url_inflight
+
+    while True:
+        future = url_inflight.get(key)
+
+        if future is not None:
+            try:
+                data = list(await asyncio.shield(future))
+                break
+
+            except asyncio.CancelledError:
+                # the owner was cancelled (e.g. a prefetch read-ahead), not us;
+                # run the query ourselves
+                if future.cancelled() and not asyncio.current_task().cancelling():
+                    continue
+                raise
+
+        future = url_inflight[key] = asyncio.get_running_loop().create_future()
+
+        try:
+            data = await _query_document(
+                async_supabase_client,
+                url=url,
+                table_name=table_name,
+                source=source,
+            )
+            _doc_cache[key] = data
+            future.set_result(data)
+            data = list(data)
+            break
+
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved; the owner re-raises below
+            raise
+
+        finally:
+            url_inflight.pop(key, None)
+
+    # Return raw or formatted data
+    if not format_fn:
+        return data
+
+    # Apply formatter and return
+    return format_fn(data)
+
+
+async def prefetch_documents_from_supabase(
+    urls: Iterable[str],
+    async_supabase_client: Optional[AsyncSupabaseClient] = None,
+    *,
+    table_name: str = "site_pages",
+    source: Optional[str] = None,
+    format_fn: Optional[Callable] = None,
+    depth: int = 2,
+) -> AsyncIterator[Tuple[str, Any]]:
+    """
+    Yield documents for a sequence of URLs, fetching the next ones early.
+
+    While the caller works on one document, the following depth documents are
+    already being retrieved with get_document_from_supabase, hiding query
+    latency behind the caller's processing. depth bounds how far ahead it
+    reads so a long URL list does not flood the connection pool or the cache.
+
+    Args:
+        urls: URLs to retrieve, in the order they should be yielded
+        async_supabase_client: Supabase client; defaults to get_shared_client()
+        table_name: Name of the table to query
+        source: Optional metadata source filter
+        format_fn: Optional function to format each document
+        depth: Number of documents to fetch ahead of the one being yielded
+
+    Yields:
+        (url, document) tuples, in the order of urls
+
+    Raises:
+        SupabaseError: If a document cannot be retrieved
+    """
+
+    if async_supabase_client is None:
+        async_supabase_client = await get_shared_client()
+
+    url_iter = iter(urls)
+    pending: Deque[Tuple[str, asyncio.Task]] = deque()
+
+    def schedule_next() -> None:
+        for url in url_iter:
+            task = asyncio.create_task(
+                get_document_from_supabase(
+                    async_supabase_client,
+                    url=url,
+                    table_name=table_name,
+                    source=source,
+                    format_fn=format_fn,
+                )
+            )
+            pending.append((url, task))
+            return
+
+    for _ in range(max(depth, 1)):
+        schedule_next()
+
+    try:
+        while pending:
+            url, task = pending.popleft()
+            schedule_next()
+
+            yield url, await task
+
+    finally:
+        # Caller stopped early or a fetch failed; drop the read-ahead
+        for _, task in pending:
+            task.cancel()
+
+        await asyncio.gather(*(task for _, task in pending), return_exceptions=True)
+
+
+async def _query_document(
+    async_supabase_client: AsyncSupabaseClient,
+    url: str,
+    table_name: str,
+    source: Optional[str],
+) -> List[dict]:
+    """Run the ordered chunk query behind get_document_from_supabase."""
     try:
-        logger.debug(f"Retrieving document from {table_name} with URL: {url}")
+        logger.debug("Retrieving document from %s with URL: %s", table_name, url)
 
         # Ensure async operation is awaited properly
         query = (
@@ -236,18 +783,14 @@ async def get_document_from_supabase(
         if source:
             query = query.eq("metadata->>source", source)
 
-        result = await query.order("chunk_number").execute()
+        async with _get_loop_state().query_sem:
+            result = await query.order("chunk_number").execute()
 
         # Process results
         data = result.data or []
-        logger.info(f"Retrieved {len(data)} chunks for document {url}")
-
-        # Return raw or formatted data
-        if not format_fn:
-            return data
+        logger.info("Retrieved %d chunks for document %s", len(data), url)
 
-        # Apply formatter and return
-        return format_fn(data)
+        return data
 
     except Exception as e:
         error_msg = f"Error retrieving document for URL: {url}"
@@ -255,24 +798,187 @@ async def get_document_from_supabase(
         raise SupabaseError(error_msg, exception=e)
 
 
-async def get_chunks_from_supabase(
+async def get_documents_from_supabase(
+    async_supabase_client: Optional[AsyncSupabaseClient] = None,
+    *,
+    urls: Iterable[str],
+    table_name: str = "site_pages",
+    source: Optional[str] = None,
+    format_fn: Optional[Callable] = None,
+    batch_size: int = 200,
+) -> Dict[str, Any]:
+    """
+    Retrieve several documents from Supabase with one query per batch of URLs.
+
+    Looping get_document_from_supabase costs a round trip per URL; this sends
+    an IN filter for up to batch_size URLs at a time (keeping the request URL
+    under PostgREST's length limit) and groups the rows by URL client-side.
+    Results share get_document_from_supabase's cache.
+
+    Args:
+        async_supabase_client: Supabase client; defaults to get_shared_client()
+        urls: URLs of the documents to retrieve
+        table_name: Name of the table to query
+        source: Optional metadata source filter
+        format_fn: Optional function to format each document
+        batch_size: Maximum number of URLs per request
+
+    Returns:
+        Dictionary mapping each URL, in the order given, to its document data,
+        either raw or formatted based on format_fn; URLs without rows map to
+        an empty document
+
+    Raises:
+        SupabaseError: If documents cannot be retrieved
+    """
+
+    urls = list(dict.fromkeys(urls))
+
+    documents = {
+        url: _doc_cache[key]
+        for url in urls
+        if (key := (table_name, url, source)) in _doc_cache
+    }
+    missing = [url for url in urls if url not in documents]
+
+    if missing:
+        if async_supabase_client is None:
+            async_supabase_client = await get_shared_client()
+
+        batches = await asyncio.gather(
+            *(
+                _query_documents(
+                    async_supabase_client,
+                    urls=missing[i : i + batch_size],
+                    table_name=table_name,
+                    source=source,
+                )
+                for i in range(0, len(missing), batch_size)
+            )
+        )
+
+        for batch in batches:
+            documents.update(batch)
+
+        for url in missing:
+            _doc_cache[(table_name, url, source)] = documents[url]
+
+    return {
+        url: format_fn(list(documents[url])) if format_fn else list(documents[url])
+        for url in urls
+    }
+
+
+async def _query_documents(
     async_supabase_client: AsyncSupabaseClient,
-    query_embedding: List[float],
+    urls: List[str],
+    table_name: str,
+    source: Optional[str],
+) -> Dict[str, List[dict]]:
+    """Run one IN query for get_documents_from_supabase and group rows by url."""
+    try:
+        logger.debug("Retrieving %d documents from %s", len(urls), table_name)
+
+        query = (
+            async_supabase_client.from_(table_name)
+            .select("url, title, content, chunk_number")
+            .in_("url", urls)
+        )
+
+        if source:
+            query = query.eq("metadata->>source", source)
+
+        async with _get_loop_state().query_sem:
+            result = await query.order("url").order("chunk_number").execute()
+
+        documents: Dict[str, List[dict]] = {url: [] for url in urls}
+
+        # Drop the url column so rows match the shape get_document_from_supabase
+        # returns and caches
+        for row in result.data or []:
+            documents[row.pop("url")].append(row)
+
+        logger.info(
+            "Retrieved %d chunks for %d URLs", len(result.data or []), len(urls)
+        )
+
+        return documents
+
+    except Exception as e:
+        error_msg = f"Error retrieving documents for {len(urls)} URLs"
+        logger.error(f"{error_msg}: {str(e)}")
+        raise SupabaseError(error_msg, exception=e)
+
+
+def fingerprint_embedding(embedding: List[float]) -> bytes:
+    """
+    Hash an embedding after normalizing it and rounding it to float16.
+
+    Embeddings within roughly 1e-3 cosine distance share a fingerprint, which
+    is close enough to reuse similarity search results for RAG.
+    """
+    norm = math.sqrt(math.fsum(value * value for value in embedding)) or 1.0
+
+    quantized = struct.pack(
+        f"<{len(embedding)}e", *(value / norm for value in embedding)
+    )
+
+    return hashlib.blake2b(quantized, digest_size=16).digest()
+
+
+def format_embedding_literal(
+    embedding: Sequence[float], significant_digits: int = 8
+) -> str:
+    """
+    Format an embedding as a compact pgvector text literal, e.g. "[0.1,-0.2]".
+
+    pgvector stores float32, so digits beyond ~8 significant figures are noise;
+    trimming them roughly halves the request body compared with the float64
+    JSON list PostgREST would otherwise receive, and skips the JSON encoder.
+    NumPy arrays (or anything with .tolist()) are accepted as well.
+    """
+    if hasattr(embedding, "tolist"):
+        embedding = embedding.tolist()
+
+    fmt = f".{significant_digits}g"
+
+    return "[" + ",".join(format(value, fmt) for value in embedding) + "]"
+
+
+async def get_chunks_from_supabase(
+    async_supabase_client: Optional[AsyncSupabaseClient] = None,
+    *,
+    query_embedding: Sequence[float],
     table_name: str = "site_pages",
     match_count: int = 5,
     source: Optional[str] = None,
     format_fn: Optional[Callable] = None,
-) -> Union[List[dict], str]:
+    stream: bool = False,
+) -> Union[List[dict], str, AsyncIterator[Any]]:
     """
     Retrieve chunks from Supabase using vector similarity search.
 
+    Rows come back most similar first, with ties ordered by (url,
+    chunk_number); sql/match_site_pages.sql does the ordering, so neither this
+    function nor the formatters sort.
+
+    With stream=True the rows are not buffered or cached: an async iterator is
+    returned that yields each row (passed through format_fn, if given) as soon
+    as it is parsed off the wire; see stream_chunks_from_supabase.
+
+    Results are cached briefly under a quantized fingerprint of the embedding
+    (see fingerprint_embedding), so retried or repeated questions skip the
+    pgvector search.
+
     Args:
-        async_supabase_client: Initialized Supabase client
-        query_embedding: Vector embedding for similarity search
+        async_supabase_client: Supabase client; defaults to get_shared_client()
+        query_embedding: Vector embedding for similarity search (list or
+            NumPy array); sent as a compact pgvector literal
         table_name: Name of the table to query
         match_count: Maximum number of matches to return
         source: Optional metadata source filter
         format_fn: Optional function to format the results
+        stream: Yield rows as they arrive instead of returning a list
 
     Returns:
         Chunks data, either raw or formatted based on format_fn
@@ -280,26 +986,54 @@ async def get_chunks_from_supabase(
     Raises:
         SupabaseError: If chunks cannot be retrieved
     """
+    if stream:
+        return stream_chunks_from_supabase(
+            async_supabase_client,
+            query_embedding=query_embedding,
+            table_name=table_name,
+            match_count=match_count,
+            source=source,
+            format_fn=format_fn,
+        )
+
+    cache_key = (
+        table_name,
+        match_count,
+        source,
+        fingerprint_embedding(query_embedding),
+    )
+
+    if cache_key in _chunks_cache:
+        data = list(_chunks_cache[cache_key])
+        return format_fn(data) if format_fn else data
+
+    if async_supabase_client is None:
+        async_supabase_client = await get_shared_client()
+
     try:
-        logger.debug(f"Retrieving chunks from {table_name} using vector search")
+        logger.debug("Retrieving chunks from %s using vector search", table_name)
 
         filter_params = {}
         if source:
             filter_params["source"] = source
 
         # Ensure async operation is awaited properly
-        result = await async_supabase_client.rpc(
-            f"match_{table_name}",
-            {
-                "query_embedding": query_embedding,
-                "match_count": match_count,
-                "filter": filter_params,
-            },
-        ).execute()
+        async with _get_loop_state().query_sem:
+            result = await async_supabase_client.rpc(
+                f"match_{table_name}",
+                {
+                    "query_embedding": format_embedding_literal(query_embedding),
+                    "match_count": match_count,
+                    "filter": filter_params,
+                },
+            ).execute()
 
         # Process results
         data = result.data or []
-        logger.info(f"Retrieved {len(data)} chunks for vector similarity search")
+        logger.info("Retrieved %d chunks for vector similarity search", len(data))
+
+        _chunks_cache[cache_key] = data
+        data = list(data)
 
         # Return raw or formatted data
         if not format_fn:
@@ -314,34 +1048,156 @@ async def get_chunks_from_supabase(
         raise SupabaseError(error_msg, exception=e)
 
 
-def build_frontmatter(data: Dict[str, Any]) -> List[str]:
-    fm = [
-        "---",
-        f"url: {sanitize_frontmatter_value(data.get('url'))}",
-        f"session_id: {sanitize_frontmatter_value(data.get('source'))}",
-    ]
+class _AsyncByteReader:
+    """Adapts an httpx byte iterator to the async read() interface ijson expects."""
 
-    if data.get("chunk_number"):
-        fm.append(
-            f"chunk_number: {sanitize_frontmatter_value(data.get('chunk_number'))}"
-        )
+    def __init__(self, chunks: AsyncIterator[bytes]):
+        self._chunks = chunks
+
+    async def read(self, size: int = -1) -> bytes:
+        # ijson probes with read(0) to detect bytes vs str; don't consume a chunk
+        if size == 0:
+            return b""
+
+        try:
+            return await self._chunks.__anext__()
+        except StopAsyncIteration:
+            return b""
+
+
+async def stream_chunks_from_supabase(
+    async_supabase_client: Optional[AsyncSupabaseClient] = None,
+    *,
+    query_embedding: Sequence[float],
+    table_name: str = "site_pages",
+    match_count: int = 5,
+    source: Optional[str] = None,
+    format_fn: Optional[Callable] = None,
+) -> AsyncIterator[Any]:
+    """
+    Stream vector similarity search results row by row.
+
+    Posts to the PostgREST RPC endpoint over the client's own pooled session
+    and headers (so the caller's auth applies) and parses the JSON array
+    incrementally with ijson, so the first row is available before the whole
+    response has arrived. The query slot is only held until the response
+    starts; the pooled connection stays in use until the iterator finishes or
+    is closed.
+
+    Args:
+        async_supabase_client: Supabase client; defaults to get_shared_client()
+        query_embedding: Vector embedding for similarity search
+        table_name: Name of the table to query
+        match_count: Maximum number of matches to return
+        source: Optional metadata source filter
+        format_fn: Optional function applied to each row
+
+    Yields:
+        Each matching row, or format_fn(row) when format_fn is given
+
+    Raises:
+        SupabaseError: If the search fails
+    """
+    if async_supabase_client is None:
+        async_supabase_client = await get_shared_client()
+
+    postgrest = async_supabase_client.postgrest
+    rpc_url = f"{str(postgrest.base_url).rstrip('/')}/rpc/match_{table_name}"
+    body = {
+        "query_embedding": format_embedding_literal(query_embedding),
+        "match_count": match_count,
+        "filter": {"source": source} if source else {},
+    }
+
+    response = None
+    row_count = 0
+
+    try:
+        # the query slot covers sending the request and waiting for the
+        # response headers; rows are then yielded as they are parsed, so a slow
+        # consumer never holds a slot other queries are waiting on
+        async with _get_loop_state().query_sem:
+            response = await postgrest.session.send(
+                postgrest.session.build_request(
+                    "POST", rpc_url, headers=postgrest.headers, json=body
+                ),
+                stream=True,
+            )
+
+        response.raise_for_status()
+
+        reader = _AsyncByteReader(response.aiter_bytes())
+
+        async for row in ijson.items_async(reader, "item", use_float=True):
+            row_count += 1
+            yield format_fn(row) if format_fn else row
 
-    if data.get("title"):
-        fm.append(f"title: {sanitize_frontmatter_value(data.get('title'))}")
+    except Exception as e:
+        error_msg = "Error streaming chunks from vector similarity search"
+        logger.error(f"{error_msg}: {str(e)}")
+        raise SupabaseError(error_msg, exception=e) from e
 
-    if data.get("summary"):
-        fm.append(f"summary: {sanitize_frontmatter_value(data.get('summary'))}")
+    finally:
+        if response is not None:
+            await response.aclose()
 
-    if data.get("embedding"):
-        fm.append(f"embedding: {sanitize_frontmatter_value(data.get('embedding'))}")
+    logger.info("Streamed %d chunks for vector similarity search", row_count)
 
-    if data.get("metadata"):
-        fm.append(f"metadata: {sanitize_frontmatter_value(data.get('metadata'))}")
 
-    fm.append(f"updated_dt: {dt.datetime.now().isoformat()}")
-    fm.append("---")
+# Optional keys, in output order; each is written only when truthy
+_FRONTMATTER_OPTIONAL_KEYS = (
+    "chunk_number",
+    "title",
+    "summary",
+    "embedding",
+    "metadata",
+)
 
-    return [line for line in fm if line is not None]
+_FRONTMATTER_TEMPLATE = (
+    "---\n"
+    "url: {url}\n"
+    "session_id: {source}\n"
+    "{optional}"
+    "updated_dt: {updated_dt}\n"
+    "---\n"
+)
+
+
+def build_frontmatter(data: Dict[str, Any], updated_dt: Optional[str] = None) -> str:
+    """
+    Render the YAML frontmatter block for a chunk in a single pass.
+
+    Args:
+        data: Chunk fields; url and source are always written, the keys in
+            _FRONTMATTER_OPTIONAL_KEYS only when present
+        updated_dt: Timestamp to record; defaults to now
+
+    Returns:
+        The frontmatter block, including the closing "---" line and newline
+    """
+    optional = "".join(
+        f"{key}: {sanitize_frontmatter_value(data[key])}\n"
+        for key in _FRONTMATTER_OPTIONAL_KEYS
+        if data.get(key)
+    )
+
+    return _FRONTMATTER_TEMPLATE.format(
+        url=sanitize_frontmatter_value(data.get("url")),
+        source=sanitize_frontmatter_value(data.get("source")),
+        optional=optional,
+        updated_dt=updated_dt or dt.datetime.now().isoformat(),
+    )
+
+
+def write_buffers(output_path: str, buffers: List[bytes]) -> None:
+    """
+    Write byte buffers to a file, truncating it, without the buffered-IO layer.
+
+    Delegates to utils.files.atomic_write: os.writev gathers every buffer in
+    one syscall where supported, and the data lands in a uniquely named temp
+    file in the same folder that is swapped in with os.replace.
+    """
+    atomic_write(output_path, buffers)
 
 
 def save_chunk_to_disk(
@@ -350,6 +1206,7 @@ def save_chunk_to_disk(
     url: str = None,
     export_folder=None,
     output_path=None,
+    updated_dt: Optional[str] = None,
 ) -> bool:
     """
     Save a data chunk to disk as a markdown file with frontmatter.
@@ -360,6 +1217,8 @@ def save_chunk_to_disk(
         url: URL of the document.
         export_folder: Folder to save the file.
         output_path: Specific file path to save the file.
+        updated_dt: Timestamp for the frontmatter; pass one value when saving
+            a batch so every file shares it. Defaults to now.
 
     Returns:
         True if the file is saved successfully, False otherwise.
@@ -378,7 +1237,7 @@ def save_chunk_to_disk(
     # Extract required fields
     content = rgd and (rgd.markdown or rgd.html) or data.get("content")
     if isinstance(content, dict):
-        content = json.dumps(content)
+        content = json_dumps(content, sort_keys=True)
     if not content or content == "{}":
         content = " "
 
@@ -392,15 +1251,71 @@ def save_chunk_to_disk(
             "summary": data.get("summary"),
             "embedding": data.get("embedding"),
             "metadata": data.get("metadata"),
-        }
+        },
+        updated_dt=updated_dt,
     )
 
-    # Write to file
+    # Write to file; frontmatter and content go out in one gathered syscall
     try:
-        with open(output_path, "w+", encoding="utf-8") as f:
-            f.write("\n".join(frontmatter + [content]))
-        logger.info(f"Successfully saved chunk to {output_path}")
+        write_buffers(
+            output_path, [frontmatter.encode("utf-8"), content.encode("utf-8")]
+        )
+
+        logger.info("Successfully saved chunk to %s", output_path)
         return True
     except Exception as e:
         logger.error(f"Error saving chunk to {output_path}: {e}")
         return False
+
+
+async def asave_chunk_to_disk(
+    rgd: ResponseGetDataSupabase = None,
+    data: Dict[str, Any] = None,
+    url: str = None,
+    export_folder=None,
+    output_path=None,
+    updated_dt: Optional[str] = None,
+) -> bool:
+    """
+    Async wrapper around save_chunk_to_disk that runs it in a worker thread.
+
+    Accepts the same arguments as save_chunk_to_disk; use this from coroutines
+    so file writes don't block the event loop.
+    """
+    return await asyncio.to_thread(
+        save_chunk_to_disk,
+        rgd=rgd,
+        data=data,
+        url=url,
+        export_folder=export_folder,
+        output_path=output_path,
+        updated_dt=updated_dt,
+    )
+
+
+async def asave_chunks_to_disk(
+    items: List[Tuple[str, Dict[str, Any]]],
+    max_concurrency: int = 32,
+    updated_dt: Optional[str] = None,
+) -> List[bool]:
+    """
+    Save many chunks to disk concurrently.
+
+    Args:
+        items: (output_path, data) pairs, as accepted by save_chunk_to_disk
+        max_concurrency: Maximum number of files written at once
+        updated_dt: Timestamp shared by every file; defaults to now, taken once
+
+    Returns:
+        The save_chunk_to_disk result for each item, in order
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    updated_dt = updated_dt or dt.datetime.now().isoformat()
+
+    async def _save(output_path: str, data: Dict[str, Any]) -> bool:
+        async with semaphore:
+            return await asave_chunk_to_disk(
+                output_path=output_path, data=data, updated_dt=updated_dt
+            )
+
+    return await asyncio.gather(*(_save(path, data) for path, data in items))
@@ -0,0 +1,25 @@
+-- Unique, sorted document URLs for get_document_urls_from_supabase.
+--
+-- Deduplicating and sorting in Postgres means only one row per page crosses the
+-- wire instead of one row per chunk. Callers page through the result with
+-- .range(), since PostgREST caps the rows returned by a single request.
+
+create or replace function distinct_urls(
+  source text default null,
+  table_name text default 'site_pages'
+)
+returns table (url text)
+language plpgsql
+stable
+as $$
+begin
+  return query execute format(
+    'select distinct t.url::text
+       from %I t
+      where $1 is null or t.metadata->>''source'' = $1
+      order by 1',
+    table_name
+  )
+  using source;
+end;
+$$;
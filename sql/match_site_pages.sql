@@ -0,0 +1,49 @@
+-- Vector search behind get_chunks_from_supabase (called as match_<table_name>).
+--
+-- The inner query orders by distance alone so the pgvector index can serve the
+-- top match_count rows; the outer query then fixes the order callers rely on:
+-- most similar first, ties broken by (url, chunk_number) so chunks of the same
+-- page come back in reading order and formatters never need to sort.
+--
+-- `metadata @> filter` is served by site_pages_metadata_gin
+-- (sql/site_pages_indexes.sql).
+
+create or replace function match_site_pages (
+  query_embedding vector(1536),
+  match_count int default 10,
+  filter jsonb default '{}'::jsonb
+)
+returns table (
+  id bigint,
+  url varchar,
+  chunk_number integer,
+  title varchar,
+  summary varchar,
+  content text,
+  metadata jsonb,
+  similarity float
+)
+language plpgsql
+stable
+as $$
+#variable_conflict use_column
+begin
+  return query
+  select m.*
+    from (
+      select site_pages.id,
+             site_pages.url,
+             site_pages.chunk_number,
+             site_pages.title,
+             site_pages.summary,
+             site_pages.content,
+             site_pages.metadata,
+             1 - (site_pages.embedding <=> query_embedding) as similarity
+        from site_pages
+       where site_pages.metadata @> filter
+       order by site_pages.embedding <=> query_embedding
+       limit match_count
+    ) m
+   order by m.similarity desc, m.url, m.chunk_number;
+end;
+$$;
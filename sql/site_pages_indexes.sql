@@ -0,0 +1,26 @@
+-- Indexes backing get_document_from_supabase and distinct_urls.
+--
+-- Both queries filter on url (and optionally metadata->>'source') and read rows
+-- in chunk_number order, so a (url, chunk_number) btree turns the per-call
+-- sort into an ordered index scan.
+--
+-- title/content are deliberately not INCLUDEd: chunk content routinely exceeds
+-- the ~2.7kB btree tuple limit and would make upserts fail.
+--
+-- CREATE INDEX CONCURRENTLY cannot run inside a transaction block; run these
+-- statements one at a time.
+
+create index concurrently if not exists site_pages_url_chunk_idx
+  on site_pages (url, chunk_number);
+
+create index concurrently if not exists site_pages_source_url_chunk_idx
+  on site_pages ((metadata->>'source'), url, chunk_number);
+
+-- match_site_pages (the standard Supabase vector-search function) filters with
+-- `metadata @> filter`; containment can only use a GIN index. jsonb_path_ops
+-- supports @> alone and is a fraction of the size of the default opclass.
+-- The url/source queries above compare metadata->>'source' directly and are
+-- served by the expression index instead.
+
+create index concurrently if not exists site_pages_metadata_gin
+  on site_pages using gin (metadata jsonb_path_ops);
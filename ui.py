@@ -7,61 +7,118 @@ from __future__ import annotations
 
 # Standard library imports
 import asyncio
+from dataclasses import dataclass
 from functools import partial
 import os
 import logging
 import sys
+from typing import Awaitable, Callable
 
 # Third-party imports
+import streamlit as st
 from dotenv import load_dotenv
-from supabase import Client as SupabaseClient
 from openai import AsyncOpenAI
 
 # Internal imports
+import routes.openai as openai_routes
+import routes.supabase as supabase_routes
 from agents.ai_expert import ai_expert as agent, PydanticAIDependencies
 from agents.ui import run_agent_with_streaming, streamlit_ui
 
 # -------------------------------------------------------------------
-# Environment Setup
+# Environment and Logging Setup
 # -------------------------------------------------------------------
 
-# Load environment variables
-# see env_sample for sample .env
-load_dotenv()
+logger = logging.getLogger(__name__)
 
-# -------------------------------------------------------------------
-# Logging Configuration
-# -------------------------------------------------------------------
 
-logger = logging.getLogger(__name__)
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[logging.StreamHandler(sys.stdout)],
-    force=True,
-)
+@dataclass(frozen=True)
+class Settings:
+    """API keys and endpoints read from the environment (see env_sample)."""
 
-# -------------------------------------------------------------------
-# API Keys and Client Initialization
-# -------------------------------------------------------------------
+    open_ai_key: str
+    supabase_url: str
+    supabase_service_key: str
 
-open_ai_key = os.environ["OPENAI_API_KEY"]
-supabase_url = os.environ["SUPABASE_URL"]
-supabase_service_key = os.environ["SUPABASE_SERVICE_KEY"]
 
-openai_client = AsyncOpenAI(api_key=open_ai_key)
-supabase: SupabaseClient = SupabaseClient(supabase_url, supabase_service_key)
+@st.cache_resource
+def get_settings() -> Settings:
+    """
+    Load .env, configure logging and read settings once per server process.
+
+    Streamlit re-executes this script on every interaction, so module-level
+    setup re-read .env and ran basicConfig(force=True), which tears down and
+    rebuilds the root handlers, on each rerun. force=True is kept so this
+    config wins over basicConfig calls made by imported modules.
+    """
+    # see env_sample for sample .env
+    load_dotenv()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+        handlers=[logging.StreamHandler(sys.stdout)],
+        force=True,
+    )
+
+    return Settings(
+        open_ai_key=os.environ["OPENAI_API_KEY"],
+        supabase_url=os.environ["SUPABASE_URL"],
+        supabase_service_key=os.environ["SUPABASE_SERVICE_KEY"],
+    )
+
+
+def get_session_resources() -> tuple:
+    """
+    Return this browser session's event loop and bound agent runner.
+
+    Streamlit re-executes the script on every interaction, so clients built at
+    module level were rebuilt (and their connection pools abandoned) on each
+    rerun. They are now created on a session's first run and kept in
+    st.session_state. Pooled async connections are bound to the loop that
+    opened them, so the session keeps one event loop too and every rerun runs
+    on it; a process-wide cache would share that loop across session threads.
+    The runner (run_agent_with_streaming bound to the agent and the session's
+    dependencies) is kept alongside them so every rerun hands streamlit_ui the
+    same callable.
+    """
+    if "resources" not in st.session_state:
+        settings = get_settings()
+        loop = asyncio.new_event_loop()
+
+        supabase = loop.run_until_complete(
+            supabase_routes.make_supabase_client(
+                settings.supabase_url, settings.supabase_service_key
+            )
+        )
+        openai_client = AsyncOpenAI(
+            api_key=settings.open_ai_key,
+            http_client=openai_routes.generate_http_client(),
+        )
+
+        dependencies = PydanticAIDependencies(
+            supabase=supabase, openai_client=openai_client
+        )
+
+        st.session_state.resources = (
+            loop,
+            partial(run_agent_with_streaming, agent=agent, dependencies=dependencies),
+        )
+
+    return st.session_state.resources
 
-dependencies = PydanticAIDependencies(supabase=supabase, openai_client=openai_client)
 
 # -------------------------------------------------------------------
 # Main Application Logic
 # -------------------------------------------------------------------
 
 
-async def main():
+async def main(run_agent: Callable[..., Awaitable[None]]):
     """
     Main entry point for the Streamlit UI application.
+
+    Args:
+        run_agent: run_agent_with_streaming bound to the agent and dependencies
     """
     logger.info("Starting the Streamlit UI for the Agent Builder...")
     try:
@@ -69,9 +126,7 @@ async def main():
             title="RAG Expert",
             description="Ask me a question about data I have collated in Supabase",
             default_chat_input="How can I help you?",
-            run_agent_with_streaming=partial(
-                run_agent_with_streaming, agent=agent, dependencies=dependencies
-            ),
+            run_agent_with_streaming=run_agent,
         )
         logger.info("Streamlit UI has been successfully launched.")
     except Exception as e:
@@ -84,6 +139,8 @@ async def main():
 # -------------------------------------------------------------------
 
 if __name__ == "__main__":
+    get_settings()
     logger.info("Initializing the main event loop...")
-    asyncio.run(main())
+    loop, run_agent = get_session_resources()
+    loop.run_until_complete(main(run_agent))
     logger.info("Application has exited.")
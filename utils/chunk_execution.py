@@ -1,6 +1,6 @@
 # %% ../../nbs/chunk_execution.ipynb 2
 import asyncio
-from typing import List, Coroutine, Any
+from typing import List, Coroutine, Any, Awaitable, Callable, Iterable
 
 
 async def gather_with_concurrency(
@@ -16,3 +16,44 @@ async def gather_with_concurrency(
             return await coro
 
     return await asyncio.gather(*(sem_coro(c) for c in coros))
+
+
+async def map_with_concurrency(
+    fn: Callable[[Any], Awaitable[Any]],  # coroutine function called once per item
+    items: Iterable[Any],  # inputs, consumed lazily
+    n=60,  # number of workers
+):
+    """runs fn over items with n workers pulling from a bounded queue
+
+    unlike gather_with_concurrency, coroutines are only created when a worker is
+    free, so memory stays O(n) however many items there are. results keep the
+    order of items; the first exception cancels the remaining work and is raised.
+    """
+
+    queue: asyncio.Queue = asyncio.Queue(maxsize=n * 2)
+    results = {}
+
+    async def producer():
+        for idx, item in enumerate(items):
+            await queue.put((idx, item))
+
+        for _ in range(n):
+            await queue.put(None)
+
+    async def worker():
+        while (job := await queue.get()) is not None:
+            idx, item = job
+            results[idx] = await fn(item)
+
+    try:
+        async with asyncio.TaskGroup() as tg:
+            tg.create_task(producer())
+
+            for _ in range(n):
+                tg.create_task(worker())
+
+    except ExceptionGroup as eg:
+        # surface the failure itself, as asyncio.gather would
+        raise eg.exceptions[0] from eg
+
+    return [results[idx] for idx in range(len(results))]
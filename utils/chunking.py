@@ -1,52 +1,85 @@
-from typing import Union, List, Callable
+import logging
+from typing import Union, Iterator, List, Callable
 
+logger = logging.getLogger(__name__)
 
-def calc_end_codeblock(chunk, chunk_size, start) -> Union[int, bool]:
-    code_block = chunk.rfind("```")
-    if code_block == -1 or code_block <= chunk_size * 0.3:
+
+# The default boundary search runs on the full text between start and end
+# rather than a sliced copy of the chunk; str.rfind(sub, lo, hi) scans the bounds
+# in place and returns an absolute offset
+
+
+def _find_end_codeblock(text, start, end, chunk_size) -> Union[int, bool]:
+    code_block = text.rfind("```", start, end)
+    if code_block == -1 or code_block - start <= chunk_size * 0.3:
         return False
 
-    return start + code_block
+    return code_block
 
 
-def calc_end_paragraph(chunk, chunk_size, start) -> Union[int, bool]:
-    last_break = chunk.rfind("\n\n")
+def _find_end_paragraph(text, start, end, chunk_size) -> Union[int, bool]:
+    last_break = text.rfind("\n\n", start, end)
 
-    if last_break == -1 or last_break <= chunk_size * 0.3:
+    if last_break == -1 or last_break - start <= chunk_size * 0.3:
         return False
 
-    return start + last_break
+    return last_break
 
 
-def calc_end_sentence(chunk, chunk_size, start) -> Union[int, bool]:
-    last_period = chunk.rfind(". ")
+def _find_end_sentence(text, start, end, chunk_size) -> Union[int, bool]:
+    last_period = text.rfind(". ", start, end)
 
-    if last_period == -1 or last_period <= chunk_size * 0.3:
+    if last_period == -1 or last_period - start <= chunk_size * 0.3:
         return False
 
-    return start + last_period + 1
+    return last_period + 1
+
+
+# Public calc_end_fns take (chunk, chunk_size, start) and return an absolute end
+
+
+def calc_end_codeblock(chunk, chunk_size, start) -> Union[int, bool]:
+    code_block = _find_end_codeblock(chunk, 0, len(chunk), chunk_size)
+    return code_block and start + code_block
+
+
+def calc_end_paragraph(chunk, chunk_size, start) -> Union[int, bool]:
+    last_break = _find_end_paragraph(chunk, 0, len(chunk), chunk_size)
+    return last_break and start + last_break
+
+
+def calc_end_sentence(chunk, chunk_size, start) -> Union[int, bool]:
+    last_period = _find_end_sentence(chunk, 0, len(chunk), chunk_size)
+    return last_period and start + last_period
 
 
 def functions_stop_on_value(functions: List[Callable], **kwargs):
     """iterate over a list of functions and return the first function that returns a value"""
 
-    return next((fn(**kwargs) for fn in functions if fn(**kwargs)), None)
+    # call each function once; filtering and yielding in one generator ran every
+    # boundary scan twice for the function that matched
+    for fn in functions:
+        value = fn(**kwargs)
+        if value:
+            return value
+
+    return None
 
 
 default_calc_end_fns = [calc_end_codeblock, calc_end_paragraph, calc_end_sentence]
 
+_default_find_end_fns = [_find_end_codeblock, _find_end_paragraph, _find_end_sentence]
 
-def chunk_text(
+
+def iter_chunk_text(
     text: str,  # text to chunk
     calc_end_fns: Union[
         List[Callable], None
     ] = None,  # list of functions to calculate the end of a chunk
     chunk_size: int = 5000,
-    debug_prn: bool = False,
-) -> List[str]:
+) -> Iterator[str]:
+    """yield chunks of text as each boundary is found; see chunk_text"""
 
-    calc_end_fns = calc_end_fns or default_calc_end_fns
-    chunks = []
     start = 0
     text_length = len(text)
 
@@ -54,28 +87,55 @@ def chunk_text(
         end = start + chunk_size
 
         if end >= text_length:
-            chunks.append(text[start:].strip())
-            break
-
-        # handle code block
-        chunk = text[start:end]
-
-        end = (
-            functions_stop_on_value(
-                functions=calc_end_fns, chunk=chunk, chunk_size=chunk_size, start=start
+            yield text[start:].strip()
+            return
+
+        # handle code block; without custom calc_end_fns the only copy made is
+        # the final chunk
+        if calc_end_fns:
+            boundary = functions_stop_on_value(
+                functions=calc_end_fns,
+                chunk=text[start:end],
+                chunk_size=chunk_size,
+                start=start,
             )
-            or end
-        )
+        else:
+            boundary = functions_stop_on_value(
+                functions=_default_find_end_fns,
+                text=text,
+                start=start,
+                end=end,
+                chunk_size=chunk_size,
+            )
+
+        end = boundary or end
 
         chunk = text[start:end].strip()
 
         if chunk:
-            chunks.append(chunk)
+            yield chunk
 
         start = max(start + 1, end)
 
+
+def chunk_text(
+    text: str,  # text to chunk
+    calc_end_fns: Union[
+        List[Callable], None
+    ] = None,  # list of functions to calculate the end of a chunk
+    chunk_size: int = 5000,
+    debug_prn: bool = False,
+) -> List[str]:
+
+    chunks = list(
+        iter_chunk_text(text, calc_end_fns=calc_end_fns, chunk_size=chunk_size)
+    )
+
     if debug_prn:
-        print(
-            f"Chunked {len(text)} character text into {len(chunks)} chunks of chunk_size {chunk_size}"
+        logger.info(
+            "Chunked %d character text into %d chunks of chunk_size %d",
+            len(text),
+            len(chunks),
+            chunk_size,
         )
     return chunks
@@ -1,14 +1,83 @@
 import re
 import logging
 import unicodedata
+from functools import lru_cache
 from urllib.parse import urlparse
-from typing import List, Any, Optional
+from typing import List, Any, Optional, Tuple, Union
 import json
 
+try:
+    import orjson
+except ImportError:  # optional speedup; fall back to the standard library
+    orjson = None
+
 # Configure logger
 logger = logging.getLogger(__name__)
 
 
+def json_loads(value: Union[str, bytes]) -> Any:
+    """Parse a JSON string, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(value)
+
+    return json.loads(value)
+
+
+def json_dumpb(value: Any, indent: bool = False, sort_keys: bool = False) -> bytes:
+    """
+    Serialize a value to UTF-8 encoded JSON bytes, using orjson when it is installed.
+
+    orjson produces bytes natively, so callers writing to disk or the network
+    skip the decode/encode round trip of json_dumps(...).encode().
+
+    Args:
+        value: The value to serialize.
+        indent: Pretty-print with a two-space indent.
+        sort_keys: Sort object keys so output is reproducible.
+
+    Returns:
+        The JSON document as bytes.
+    """
+    if orjson is not None:
+        # OPT_NON_STR_KEYS matches the standard library, which stringifies keys
+        option = (
+            orjson.OPT_NON_STR_KEYS
+            | (orjson.OPT_INDENT_2 if indent else 0)
+            | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+        )
+        return orjson.dumps(value, option=option)
+
+    if indent:
+        return json.dumps(
+            value, indent=2, sort_keys=sort_keys, ensure_ascii=False
+        ).encode("utf-8")
+
+    return json.dumps(
+        value, separators=(",", ":"), sort_keys=sort_keys, ensure_ascii=False
+    ).encode("utf-8")
+
+
+def json_dumps(value: Any, indent: bool = False, sort_keys: bool = False) -> str:
+    """
+    Serialize a value to a compact JSON string, using orjson when it is installed.
+
+    Args:
+        value: The value to serialize.
+        indent: Pretty-print with a two-space indent.
+        sort_keys: Sort object keys so output is reproducible.
+
+    Returns:
+        The JSON string.
+    """
+    if orjson is not None:
+        return json_dumpb(value, indent=indent, sort_keys=sort_keys).decode("utf-8")
+
+    if indent:
+        return json.dumps(value, indent=2, sort_keys=sort_keys)
+
+    return json.dumps(value, separators=(",", ":"), sort_keys=sort_keys)
+
+
 def extract_domain(url: str) -> str:
     """Extract the domain from a given URL."""
 
@@ -16,6 +85,10 @@ def extract_domain(url: str) -> str:
     return str(parsed_url.netloc)
 
 
+# Compiled once; re.sub with a string pattern pays a cache lookup per call
+_NON_ALPHANUMERIC_RE = re.compile(r"[^0-9a-zA-Z_\-\s]+")
+
+
 def keep_alphanumeric(text: str) -> str:
     """
     Remove all non-alphanumeric characters from a string.
@@ -39,8 +112,7 @@ def keep_alphanumeric(text: str) -> str:
     if not text:
         return ""
 
-    pattern = r"[^0-9a-zA-Z_\-\s]+"
-    return re.sub(pattern, "", text)
+    return _NON_ALPHANUMERIC_RE.sub("", text)
 
 
 def to_snake_case(text: str) -> str:
@@ -68,6 +140,21 @@ def to_snake_case(text: str) -> str:
     return text.replace(" ", "_").lower()
 
 
+def _strip_marks(text: str) -> str:
+    return "".join(
+        c for c in unicodedata.normalize("NFD", text) if unicodedata.category(c) != "Mn"
+    )
+
+
+# Latin-1 Supplement and Latin Extended-A letters whose accent-stripped form is
+# ASCII (é -> e); anything else falls back to NFD in remove_accents
+_ACCENT_TABLE = {
+    code: stripped
+    for code in range(0xC0, 0x180)
+    if (stripped := _strip_marks(chr(code))) != chr(code) and stripped.isascii()
+}
+
+
 def remove_accents(text: str) -> str:
     """
     Remove accents and diacritical marks from a string.
@@ -90,11 +177,19 @@ def remove_accents(text: str) -> str:
     if not text:
         return ""
 
-    return "".join(
-        c for c in unicodedata.normalize("NFD", text) if unicodedata.category(c) != "Mn"
-    )
+    # ASCII has no combining marks; skip normalizing and walking every character
+    if text.isascii():
+        return text
+
+    # accented Latin letters are stripped in one C-level pass
+    text = text.translate(_ACCENT_TABLE)
+    if text.isascii():
+        return text
 
+    return _strip_marks(text)
 
+
+@lru_cache(maxsize=65_536)
 def create_safe_file_name(text: str) -> str:
     """
     Convert a string to a clean, safe filename.
@@ -102,6 +197,8 @@ def create_safe_file_name(text: str) -> str:
     This function applies a series of transformations to create a filename
     that is safe to use across operating systems by removing accents,
     converting to snake_case, and keeping only alphanumeric characters.
+    Results are memoized: every URL of a crawl shares its domain, so most
+    calls from convert_url_to_file_name repeat an earlier input.
 
     Args:
         text: The string to convert
@@ -121,6 +218,10 @@ def create_safe_file_name(text: str) -> str:
     return keep_alphanumeric(to_snake_case(remove_accents(text)))
 
 
+# Characters that would break a YAML frontmatter line, mapped to underscores
+_FRONTMATTER_UNSAFE_CHARS = str.maketrans(dict.fromkeys("\n\r:#", "_"))
+
+
 def sanitize_frontmatter_value(value: Any) -> Optional[str]:
     """
     Replace unsafe characters in values for YAML frontmatter with underscores.
@@ -134,23 +235,54 @@ def sanitize_frontmatter_value(value: Any) -> Optional[str]:
     if value is None:
         return None
     if isinstance(value, (dict, list)):
-        return json.dumps(value)  # Serialize complex types as JSON
+        # Serialize complex types as JSON; sorted keys keep file content stable
+        return json_dumps(value, sort_keys=True)
     if isinstance(value, str):
-        # Replace unsafe characters with underscores
-        unsafe_chars = ["\n", "\r", ":", "#"]
-        for char in unsafe_chars:
-            value = value.replace(char, "_")
-        return value.strip()
+        # Replace unsafe characters with underscores in a single C-level pass
+        return value.translate(_FRONTMATTER_UNSAFE_CHARS).strip()
     return str(value)  # Convert other types to string
 
 
+# Characters urlparse treats specially beyond scheme://netloc/path?query#fragment
+_URL_SLOW_PATH_CHARS = frozenset("\t\r\n;[")
+
+
+def _split_netloc_path(url: str) -> Tuple[str, str]:
+    """
+    Return (netloc, path) as urlparse would, with str.find for plain http(s) URLs.
+
+    urlparse builds a full named tuple and validates every component; crawled
+    URLs are almost always the simple case, which reduces to a few finds and
+    slices. Anything unusual (params, IPv6 hosts, embedded whitespace) goes
+    through urlparse.
+    """
+    if url.startswith(("https://", "http://")) and _URL_SLOW_PATH_CHARS.isdisjoint(url):
+        rest = url[url.find("://") + 3 :]
+
+        for sep in "#?":
+            i = rest.find(sep)
+            if i >= 0:
+                rest = rest[:i]
+
+        i = rest.find("/")
+        if i < 0:
+            return rest, ""
+
+        return rest[:i], rest[i:]
+
+    parsed_url = urlparse(url)
+    return parsed_url.netloc, parsed_url.path
+
+
+@lru_cache(maxsize=100_000)
 def convert_url_to_file_name(url: str) -> str:
     """
     Convert a URL to a safe file path while preserving structure.
 
     This function extracts the domain and path from a URL and converts
     them to a safe file path format, preserving the hierarchical structure
-    but replacing unsafe characters.
+    but replacing unsafe characters. Results are memoized since the same URL
+    is converted once per chunk and again on every storage callback.
 
     Args:
         url: The URL to convert
@@ -168,20 +300,20 @@ def convert_url_to_file_name(url: str) -> str:
         return ""
 
     try:
-        # Parse the URL into components
-        parsed_url = urlparse(url)
+        # Split the URL into domain (netloc) and path
+        netloc, path = _split_netloc_path(url)
 
         # Extract and clean the domain (netloc)
-        domain = parsed_url.netloc.replace("www.", "").replace(".", "_")
+        domain = netloc.replace("www.", "").replace(".", "_")
 
         # Extract and clean the path
-        path = parsed_url.path[1:].replace("/", "_")
+        path = path[1:].replace("/", "_")
 
         # Use 'index' for empty paths (root of domain)
         if not path:
             path = "index"
 
-        logger.debug(f"Processing URL path: {path}")
+        logger.debug("Processing URL path: %s", path)
 
         # Apply safe filename conversion to both parts
         clean_parts: List[str] = [create_safe_file_name(val) for val in [domain, path]]
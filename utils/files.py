@@ -9,8 +9,11 @@ to minimize errors when manipulating files and directories.
 
 Core Functions:
 - upsert_folder: Create or update a directory, optionally replacing existing folders
+- aupsert_folder: upsert_folder run in a worker thread for use from coroutines
 - read_md_from_disk: Read a markdown file with frontmatter support
 - save_to_disk: Save data to disk with intelligent handling of different data types
+- asave_to_disk: save_to_disk run in a worker thread for use from coroutines
+- sync_pending_writes: fsync every file saved with durable=True since the last sync
 - get_file_extension: Extract file extension from a path
 - change_file_extension: Get a new file path with a changed extension
 
@@ -47,15 +50,26 @@ except FileError as e:
 
 # Standard library imports
 import os
-import json
+import re
 import shutil
+import asyncio
+import uuid
 import logging
-from typing import Any, Dict, Tuple, Optional
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple, Optional, Sequence
 import frontmatter
 
+from utils.convert import json_dumpb, json_dumps, json_loads
+
 # Configure logging at module level
 logger = logging.getLogger(__name__)
 
+# Directories upsert_folder has already created in this process
+_created_folders: set = set()
+
+# Files saved with durable=True that have not been fsynced yet
+_pending_sync: List[str] = []
+
 
 class FileError(Exception):
     """Custom exception for file operations."""
@@ -104,11 +118,16 @@ def upsert_folder(
         # Get absolute path for consistent operations and logging
         abs_path = os.path.abspath(folder_path)
 
-        # Replace existing folder if requested
-        if replace_folder and os.path.exists(abs_path) and os.path.isdir(abs_path):
+        # Replace existing folder if requested; isdir is False for missing paths
+        if replace_folder and os.path.isdir(abs_path):
             if debug_prn:
                 logger.info("Removing existing folder: %s", abs_path)
             shutil.rmtree(abs_path)
+            _created_folders.discard(abs_path)
+
+        # Crawls write many files per directory; skip the syscall after the first
+        elif abs_path in _created_folders:
+            return abs_path
 
         # Print debug information if requested
         if debug_prn:
@@ -119,10 +138,9 @@ def upsert_folder(
                 }
             )
 
-        # Create directory if it doesn't exist
-        if not os.path.exists(abs_path):
-            os.makedirs(abs_path)
-            logger.debug(f"Created directory: {abs_path}")
+        # One call, no exists() check to race against
+        os.makedirs(abs_path, exist_ok=True)
+        _created_folders.add(abs_path)
 
         return abs_path
 
@@ -131,6 +149,25 @@ def upsert_folder(
         raise FileError("Failed to create directory", path=folder_path, exception=e)
 
 
+async def aupsert_folder(
+    folder_path: str, debug_prn: bool = False, replace_folder: bool = False
+) -> str:
+    """
+    Async wrapper around upsert_folder that runs it in a worker thread.
+
+    With replace_folder=True the existing tree is removed with shutil.rmtree,
+    which unlinks every file; running it off the event loop lets crawls keep
+    fetching meanwhile. Callers replacing overlapping folders concurrently
+    should not rely on the order the threads finish in.
+    """
+    return await asyncio.to_thread(
+        upsert_folder,
+        folder_path=folder_path,
+        debug_prn=debug_prn,
+        replace_folder=replace_folder,
+    )
+
+
 class ReadMarkdown_Exception(Exception):
     def __init__(self, message: str, path: Optional[str] = None):
         super().__init__(message)
@@ -141,12 +178,67 @@ class ReadMarkdown_Exception(Exception):
             self.message = message
 
 
-def read_md_from_disk(file_path: str) -> Tuple[str, Dict[str, Any]]:
+# Frontmatter lines whose value is a JSON array or object, as written by
+# sanitize_frontmatter_value (e.g. a chunk's embedding)
+_JSON_FRONTMATTER_LINE_RE = re.compile(r"^([A-Za-z_][\w-]*): ([\[{].*)\n", re.M)
+
+
+def _split_json_frontmatter(text: str) -> Tuple[str, Dict[str, Any]]:
+    """
+    Pull JSON-valued lines out of a frontmatter block and parse them with orjson.
+
+    A 1536-float embedding takes ~10 ms to load through libyaml (~70 ms with
+    the pure-Python loader) and ~0.1 ms through orjson. Returns the text with
+    those lines removed plus their parsed values; lines that are not valid
+    JSON are left for the YAML loader.
+    """
+    if not text.startswith("---\n"):
+        return text, {}
+
+    end = text.find("\n---", 3)
+    if end == -1:
+        return text, {}
+
+    values = {}
+
+    def _parse_line(match: re.Match) -> str:
+        try:
+            values[match[1]] = json_loads(match[2])
+        except ValueError:
+            return match[0]
+
+        return ""
+
+    header = _JSON_FRONTMATTER_LINE_RE.sub(_parse_line, text[: end + 1])
+
+    if not values:
+        return text, {}
+
+    return header + text[end + 1 :], values
+
+
+@lru_cache(maxsize=256)
+def _load_md(file_path: str, mtime_ns: int, size: int) -> Tuple[str, Dict[str, Any]]:
+    """Parse a markdown file; keyed on mtime/size so edited files are re-read."""
+    with open(file_path, "r", encoding="utf-8") as f:
+        text, json_values = _split_json_frontmatter(f.read())
+
+    data = frontmatter.loads(text)
+    return data.content, {**data.metadata, **json_values}
+
+
+def read_md_from_disk(
+    file_path: str, force_refresh: bool = False
+) -> Tuple[str, Dict[str, Any]]:
     """
     Reads a markdown file with frontmatter.
 
+    Parsed files are cached by (path, mtime, size), so re-reading an unchanged
+    file across retries and re-runs costs a single stat call.
+
     Args:
         file_path (str): Path to the markdown file.
+        force_refresh (bool, optional): Re-read the file even if it is cached.
 
     Returns:
         Tuple[str, Dict[str, Any]]: Tuple containing (content, frontmatter attributes)
@@ -156,14 +248,17 @@ def read_md_from_disk(file_path: str) -> Tuple[str, Dict[str, Any]]:
     """
 
     try:
-        # Check if file exists
-        if not os.path.exists(file_path):
+        # One stat both checks the file exists and keys the cache
+        try:
+            st = os.stat(file_path)
+        except FileNotFoundError:
             raise FileError(f"File does not exist", path=file_path)
 
-        # Read file with frontmatter
-        data = frontmatter.load(file_path)
+        load = _load_md.__wrapped__ if force_refresh else _load_md
+        content, metadata = load(file_path, st.st_mtime_ns, st.st_size)
 
-        return data.content, data.metadata
+        # Copy so callers can't mutate the cached frontmatter
+        return content, dict(metadata)
 
     except FileError as e:
         logger.error("Error reading markdown file %s: %s", file_path, str(e))
@@ -235,12 +330,87 @@ def change_file_extension(file_path: str, extension: str) -> str:
     return new_file_path
 
 
+def _encode_json(data: Any, encoding: str, indent: bool = False) -> bytes:
+    """Serialize data to JSON bytes, skipping the str round trip for UTF-8."""
+    if encoding.lower().replace("-", "") == "utf8":
+        return json_dumpb(data, indent=indent)
+
+    return json_dumps(data, indent=indent).encode(encoding)
+
+
+def atomic_write(path: str, buffers: Sequence[bytes], durable: bool = False) -> int:
+    """
+    Write byte buffers to path atomically and return the byte count.
+
+    Skips the buffered file object entirely: os.writev gathers every buffer
+    in one syscall where the platform supports it, with an os.write loop for
+    short writes. Data goes to a uniquely named temp file in the same folder
+    that is swapped in with os.replace, so readers never see a half-written
+    file and concurrent writers of the same path never share a temp file.
+    With durable=True the path is queued for sync_pending_writes.
+
+    Args:
+        path (str): Destination file path
+        buffers (Sequence[bytes]): Byte buffers written in order
+        durable (bool): Queue the file for sync_pending_writes
+
+    Returns:
+        int: Number of bytes written
+    """
+    folder, name = os.path.split(path)
+    tmp_path = os.path.join(folder, f".{name}.{uuid.uuid4().hex}.tmp")
+
+    # O_EXCL on a unique name keeps concurrent writers apart; the kernel applies
+    # the umask to 0o666, as it would for a plain open()
+    fd = os.open(
+        tmp_path,
+        os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0),
+        0o666,
+    )
+
+    try:
+        try:
+            written = os.writev(fd, buffers) if hasattr(os, "writev") else 0
+            total = sum(len(buffer) for buffer in buffers)
+
+            if written != total:
+                # Regular files rarely short-write, but finish the job if they do
+                view = memoryview(b"".join(buffers))[written:]
+                while view:
+                    view = view[os.write(fd, view) :]
+
+        finally:
+            os.close(fd)
+
+        os.replace(tmp_path, path)
+
+    except BaseException:
+        # never leave the temp file behind, whether the write or the swap failed
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+    if durable:
+        _pending_sync.append(path)
+
+    return total
+
+
+def _write_bytes(path: str, payload: bytes, durable: bool = False) -> int:
+    """Write payload to path with atomic_write and return the byte count."""
+    return atomic_write(path, [payload], durable=durable)
+
+
 def save_to_disk(
     output_path: str,
     data: Any,
     is_binary: bool = False,
     encoding: str = "utf-8",
     replace_folder: bool = False,
+    durable: bool = False,
+    indent: bool = False,
 ) -> int:
     """
     Saves data to disk with intelligent handling of different data types.
@@ -254,7 +424,7 @@ def save_to_disk(
     - Directory creation if needed
     - Proper encoding and formatting of data
     - Consistent error handling with detailed error messages
-    - JSON auto-formatting for dictionary data
+    - Compact JSON for dictionary data, pretty-printed on request
 
     Args:
         output_path (str): Path where the file should be saved
@@ -262,6 +432,11 @@ def save_to_disk(
         is_binary (bool, optional): Force binary mode writing even for text data
         encoding (str, optional): Character encoding for text files
         replace_folder (bool, optional): Replace existing folder if True
+        durable (bool, optional): Queue the file for the next sync_pending_writes
+            call rather than leaving it to the OS to flush
+        indent (bool, optional): Pretty-print dictionary JSON with a two-space
+            indent for files people will read; compact output is smaller and
+            faster to encode
 
     Returns:
         int: Number of bytes written to the file
@@ -294,9 +469,9 @@ def save_to_disk(
             json_path = change_file_extension(output_path, ".json")
             logger.debug("Saving dictionary as JSON to %s", json_path)
 
-            with open(json_path, "w", encoding=encoding) as f:
-                json.dump(data, f, indent=4)
-                return f.tell()  # Return file position as byte count
+            json_data = _encode_json(data, encoding, indent=indent)
+
+            return _write_bytes(json_path, json_data, durable=durable)
 
         # Handle binary data
         if is_binary or isinstance(data, bytes):
@@ -306,30 +481,96 @@ def save_to_disk(
             if not isinstance(data, bytes):
                 try:
                     json_path = change_file_extension(output_path, ".json")
-                    json_data = json.dumps(data).encode(encoding)
+                    json_data = _encode_json(data, encoding)
 
-                    with open(json_path, "wb") as f:
-                        f.write(json_data)
-                        return len(json_data)
+                    return _write_bytes(json_path, json_data, durable=durable)
 
-                except (TypeError, json.JSONDecodeError):
+                except (TypeError, ValueError):
                     # Not JSON serializable, continue to standard binary write
                     logger.debug("Data not JSON serializable, writing as raw binary")
 
             # Standard binary write
-            with open(output_path, "wb") as f:
-                byte_count = f.write(
-                    data if isinstance(data, bytes) else str(data).encode(encoding)
-                )
-                return byte_count
+            return _write_bytes(
+                output_path,
+                data if isinstance(data, bytes) else str(data).encode(encoding),
+                durable=durable,
+            )
 
-        # Handle text data
+        # Handle text data; encode once and write the bytes that are counted
         logger.debug("Saving text data to %s", output_path)
-        with open(output_path, "w", encoding=encoding) as f:
-            text_data = str(data)
-            f.write(text_data)
-            return len(text_data.encode(encoding))  # Return byte count
+        return _write_bytes(output_path, str(data).encode(encoding), durable=durable)
 
     except Exception as e:
         logger.error("Error saving data to %s: %s", output_path, str(e))
         raise FileError("Failed to save data to disk", path=output_path, exception=e)
+
+
+async def asave_to_disk(
+    output_path: str,
+    data: Any,
+    is_binary: bool = False,
+    encoding: str = "utf-8",
+    replace_folder: bool = False,
+    durable: bool = False,
+    indent: bool = False,
+) -> int:
+    """
+    Async wrapper around save_to_disk that runs it in a worker thread.
+
+    Accepts the same arguments as save_to_disk; use this from coroutines so
+    serializing and writing a large dict doesn't block the event loop.
+    """
+    return await asyncio.to_thread(
+        save_to_disk,
+        output_path=output_path,
+        data=data,
+        is_binary=is_binary,
+        encoding=encoding,
+        replace_folder=replace_folder,
+        durable=durable,
+        indent=indent,
+    )
+
+
+def sync_pending_writes() -> int:
+    """
+    fsync every file saved with durable=True since the last call.
+
+    An fsync per file would stall a crawl on every write; batching lets the
+    caller pay for durability once per group of files (e.g. once per page),
+    the way databases group-commit. Each file is fsynced, then each parent
+    directory once so the renames made by the atomic writes persist too.
+
+    Returns:
+        int: Number of files synced
+
+    Raises:
+        FileError: If a file or directory cannot be synced
+    """
+    paths, _pending_sync[:] = list(_pending_sync), []
+
+    for path in dict.fromkeys(paths):
+        try:
+            fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+        except OSError as e:
+            raise FileError("Failed to sync file", path=path, exception=e)
+
+    # Directories can't be opened for fsync on Windows
+    if os.name == "posix":
+        for folder in dict.fromkeys(os.path.dirname(path) or "." for path in paths):
+            try:
+                fd = os.open(folder, os.O_RDONLY)
+                try:
+                    os.fsync(fd)
+                finally:
+                    os.close(fd)
+
+            except OSError as e:
+                raise FileError("Failed to sync directory", path=folder, exception=e)
+
+    return len(paths)